@@ -0,0 +1,96 @@
+"""
+Pool of qualified IB contracts.
+Qualifying a contract is a TWS round-trip whose result (conId, exchange
+details) doesn't change during a session, so each contract is qualified once
+and the qualified object is reused afterwards.
+"""
+from ib_insync import Option, Stock, util
+import threading
+
+# Pool key -> qualified contract
+_pool = {}
+_lock = threading.Lock()
+
+
+async def _qualify_async(ib, keyed):
+    """
+    Qualify contracts, reusing the ones already in the pool.
+
+    Only contracts missing from the pool are built and sent to TWS, all in
+    one qualifyContracts call; successfully qualified ones are pooled.
+
+    Args:
+        ib: Connected IB instance
+        keyed: List of (pool key, zero-argument factory building the contract)
+
+    Returns:
+        List of contracts in input order (conId is 0 where qualification failed)
+    """
+    contracts = [_pool.get(key) for key, _ in keyed]
+    todo = [(i, factory()) for i, ((_, factory), contract) in enumerate(zip(keyed, contracts))
+            if contract is None]
+    if todo:
+        await ib.qualifyContractsAsync(*(contract for _, contract in todo))
+        with _lock:
+            for i, contract in todo:
+                if contract.conId:
+                    _pool[keyed[i][0]] = contract
+                contracts[i] = contract
+    return contracts
+
+
+async def qualify_options_async(ib, symbol, expiry, right, legs):
+    """
+    Get qualified option contracts for several strike/exchange combinations.
+
+    Args:
+        ib: Connected IB instance
+        symbol: Underlying symbol
+        expiry: Expiration date (YYYYMMDD)
+        right: 'C' for call or 'P' for put
+        legs: Iterable of (strike, exchange) pairs
+
+    Returns:
+        List of Option contracts in input order (conId is 0 where qualification failed)
+    """
+    keyed = [(('OPT', symbol, expiry, strike, right, exchange),
+              lambda strike=strike, exchange=exchange: Option(
+                  symbol, expiry, strike, right, exchange=exchange, currency='USD', tradingClass=symbol))
+             for strike, exchange in legs]
+    return await _qualify_async(ib, keyed)
+
+
+def qualify_options(ib, symbol, expiry, right, legs):
+    """Blocking version of qualify_options_async()."""
+    return util.run(qualify_options_async(ib, symbol, expiry, right, legs))
+
+
+async def qualify_stock_async(ib, symbol, primary_exchange=None):
+    """
+    Get a qualified SMART-routed stock contract.
+
+    Args:
+        ib: Connected IB instance
+        symbol: Stock symbol
+        primary_exchange: Primary exchange hint (e.g. 'NASDAQ'), or None
+
+    Returns:
+        Stock contract (conId is 0 if qualification failed)
+    """
+    if primary_exchange is None:
+        factory = lambda: Stock(symbol, 'SMART', 'USD')
+    else:
+        factory = lambda: Stock(symbol, 'SMART', 'USD', primaryExchange=primary_exchange)
+    stock, = await _qualify_async(ib, [(('STK', symbol, primary_exchange), factory)])
+    return stock
+
+
+def qualify_stock(ib, symbol, primary_exchange=None):
+    """Blocking version of qualify_stock_async()."""
+    return util.run(qualify_stock_async(ib, symbol, primary_exchange))
+
+
+def clear_pool():
+    """Forget all pooled contracts."""
+    with _lock:
+        _pool.clear()
@@ -2,7 +2,14 @@
 Display and formatting functions with color support.
 """
 from datetime import datetime, timezone
-from utils import dte
+import sys
+from operator import itemgetter
+from utils import dte, is_missing
+
+# Horizontal rules for the roll tables and the positions summary
+_HR_EQ = "=" * 150
+_HR_DASH = "-" * 150
+_HR_DASH_SUMMARY = "-" * 85
 
 
 # ANSI color codes
@@ -20,7 +27,53 @@ class Colors:
     
     # Highlight colors
     HIGHLIGHT = '\033[7m'   # Reverse video
+
+
+# Module-level aliases for the per-row code (plain global lookups, no class attribute access)
+RESET = Colors.RESET
+EXCELLENT = Colors.EXCELLENT
+GOOD = Colors.GOOD
+MODERATE = Colors.MODERATE
+POOR = Colors.POOR
+NEGATIVE = Colors.NEGATIVE
+
+
+def _num(value, default=0):
+    """Return value, or default if it is None or NaN."""
+    return default if is_missing(value) else value
+
+
+def _fmt(value, template, default="N/A"):
+    """
+    Format a possibly-missing number with a str.format template.
+    
+    Args:
+        value: Number to format (None and NaN count as missing)
+        template: Format template, e.g. "${:.2f}"
+        default: String returned for missing values
     
+    Returns:
+        Formatted string
+    """
+    return default if is_missing(value) else template.format(value)
+
+
+# Premium-efficiency thresholds (checked in order, inclusive) and their colors
+_ROI_COLOR_THRESHOLDS = (
+    (90.0, EXCELLENT),
+    (75.0, GOOD),
+    (50.0, MODERATE),
+)
+
+
+# Roll option row layout, plus one pre-colored copy per ROI color
+_ROW_TEMPLATE_PLAIN = ("{typ:<20} {strike:>8,.2f} {expiry:<12} {dte:>4} {new_delta:>7} {net_delta:>7} "
+                       "${mark:>7,.2f} {net:>8} {total:>10} {eff:>6} {roi:>6} {ann:>6} {per_dte:>8}")
+_ROW_TEMPLATES = {
+    color: color + _ROW_TEMPLATE_PLAIN + RESET
+    for color in (EXCELLENT, GOOD, MODERATE, POOR, NEGATIVE)
+}
+
 
 def get_roi_color(roi):
     """
@@ -32,165 +85,182 @@ def get_roi_color(roi):
     Returns:
         ANSI color code string
     """
-    if roi >= 90.0:
-        return Colors.EXCELLENT  # >= 90%
-    elif roi >= 75.0:
-        return Colors.GOOD       # >= 75%
-    elif roi >= 50.0:
-        return Colors.MODERATE   # >= 50%
-    elif roi > 0:
-        return Colors.POOR       # > 0%
-    else:
-        return Colors.NEGATIVE   # <= 0%
+    for threshold, color in _ROI_COLOR_THRESHOLDS:
+        if roi >= threshold:
+            return color
+    # > 0% is poor; <= 0% (and NaN) is negative
+    return POOR if roi > 0 else NEGATIVE
+
 
+def _colored_row_template(premium_eff):
+    """Row template colored by premium efficiency."""
+    return _ROW_TEMPLATES[get_roi_color(premium_eff)]
 
-def print_roll_options(roll_info, use_colors=True):
+
+def _plain_row_template(premium_eff):
+    """Uncolored row template (premium efficiency is ignored)."""
+    return _ROW_TEMPLATE_PLAIN
+
+
+def print_roll_options(roll_info, use_colors=True, file=None):
     """
     Print formatted roll options with color-coded ROI.
     
     Args:
         roll_info: Dictionary containing roll option information
         use_colors: Whether to use ANSI color codes (default: True)
+        file: Stream to write to (default: sys.stdout)
     """
-    import math
-    
-    print("\n" + "="*150)
-    print("📊 ROLL OPTIONS AVAILABLE")
-    print("="*150)
+    out = []
+    out.append("\n" + _HR_EQ)
+    out.append("📊 ROLL OPTIONS AVAILABLE")
+    out.append(_HR_EQ)
     
     right = roll_info.get('right', 'C')
     position_type = "Covered Call" if right == 'C' else "Cash-Secured Put"
     
     spot = roll_info.get('spot')
-    spot_str = f"${spot:,.2f}" if spot and not math.isnan(spot) else "N/A"
-    print(f"Symbol: {roll_info['symbol']}  |  Type: {position_type}  |  Spot: {spot_str}  |  Contracts: {roll_info['contracts']}")
+    spot_str = f"${spot:,.2f}" if spot and not is_missing(spot) else "N/A"
+    out.append(f"Symbol: {roll_info['symbol']}  |  Type: {position_type}  |  Spot: {spot_str}  |  Contracts: {roll_info['contracts']}")
     
-    print(f"\nCURRENT POSITION:")
+    out.append(f"\nCURRENT POSITION:")
     current_delta = roll_info.get('current_delta')
-    current_delta_str = f"{current_delta:.3f}" if current_delta and not math.isnan(current_delta) else "N/A"
+    current_delta_str = f"{current_delta:.3f}" if current_delta and not is_missing(current_delta) else "N/A"
     
     buyback = roll_info['buyback_cost']
-    buyback_str = f"${buyback:,.2f}" if buyback and not math.isnan(buyback) else "N/A"
+    buyback_str = f"${buyback:,.2f}" if buyback and not is_missing(buyback) else "N/A"
     
     pnl = roll_info['current_pnl']
-    if pnl and not math.isnan(pnl):
+    if pnl and not is_missing(pnl):
         pnl_pct = (pnl / roll_info['entry_credit'] * 100) if roll_info['entry_credit'] > 0 else 0
         pnl_str = f"${pnl:,.2f} ({pnl_pct:.1f}%)"
     else:
         pnl_str = "N/A"
     
-    print(f"  Strike: ${roll_info['current_strike']:,.2f}  |  Expiry: {roll_info['current_expiry']}  |  DTE: {roll_info['current_dte']}  |  Delta: {current_delta_str}")
-    print(f"  Entry Credit: ${roll_info['entry_credit']:,.2f}  |  Buyback Cost: {buyback_str}")
-    print(f"  Current P&L: {pnl_str}")
+    out.append(f"  Strike: ${roll_info['current_strike']:,.2f}  |  Expiry: {roll_info['current_expiry']}  |  DTE: {roll_info['current_dte']}  |  Delta: {current_delta_str}")
+    out.append(f"  Entry Credit: ${roll_info['entry_credit']:,.2f}  |  Buyback Cost: {buyback_str}")
+    out.append(f"  Current P&L: {pnl_str}")
+    
+    out.append(f"\nROLL OPTIONS:")
+    out.append(f"{'Type':<20} {'Strike':>8} {'Expiry':<12} {'DTE':>4} {'NewΔ':>7} {'NetΔ':>7} {'Premium':>8} {'Net':>8} {'Total $':>10} {'Eff%':>6} {'ROI%':>6} {'Ann%':>6} {'$/DTE':>8}")
+    out.append(_HR_DASH)
     
-    print(f"\nROLL OPTIONS:")
-    print(f"{'Type':<20} {'Strike':>8} {'Expiry':<12} {'DTE':>4} {'NewΔ':>7} {'NetΔ':>7} {'Premium':>8} {'Net':>8} {'Total $':>10} {'Eff%':>6} {'ROI%':>6} {'Ann%':>6} {'$/DTE':>8}")
-    print("-" * 150)
+    # Dollars per $1 of net credit across the whole position (same for every row)
+    multiplier = roll_info['contracts'] * 100
     
-    # Sort options by Capital ROI descending (best earnings first)
-    sorted_options = sorted(roll_info['options'], 
-                           key=lambda x: x.get('capital_roi', -999) if x.get('capital_roi') is not None and not math.isnan(x.get('capital_roi', 0)) else -999, 
-                           reverse=True)
+    # Row color is based on Premium Efficiency; choose colored or plain rows once
+    row_template = _colored_row_template if use_colors else _plain_row_template
+    
+    # Sort options by Capital ROI descending (best earnings first).
+    # Options without a usable ROI are kept, in their original order, at the end.
+    sorted_options = [o for o in roll_info['options'] if not is_missing(o.get('capital_roi'))]
+    sorted_options.sort(key=itemgetter('capital_roi'), reverse=True)
+    sorted_options += [o for o in roll_info['options'] if is_missing(o.get('capital_roi'))]
     
     for opt in sorted_options:
         data = opt['data']
-        net_credit = opt['net_credit']
+        days = data['dte']
         net_delta = opt.get('net_delta')
-        premium_eff = opt.get('premium_efficiency', 0)
-        capital_roi = opt.get('capital_roi', 0)
-        ann_roi = opt.get('annualized_roi', 0)
         
         # Handle NaN values
-        if net_credit is None or math.isnan(net_credit):
-            net_credit = 0
-        if premium_eff is None or math.isnan(premium_eff):
-            premium_eff = 0
-        if capital_roi is None or math.isnan(capital_roi):
-            capital_roi = 0
-        if ann_roi is None or math.isnan(ann_roi):
-            ann_roi = 0
+        net_credit = _num(opt['net_credit'])
+        premium_eff = _num(opt.get('premium_efficiency', 0))
+        capital_roi = _num(opt.get('capital_roi', 0))
+        ann_roi = _num(opt.get('annualized_roi', 0))
 
         # Inline calculation for presentation purposes only 
-        total_income = net_credit * roll_info['contracts'] * 100
+        total_income = net_credit * multiplier
         
-        new_delta_str = f"{data['delta']:.3f}" if data['delta'] and not math.isnan(data['delta']) else "N/A"
-        net_delta_str = f"{net_delta:+.3f}" if net_delta is not None and not math.isnan(net_delta) else "N/A"
+        # A zero delta means no Greeks came back: shown as N/A
+        new_delta_str = _fmt(data['delta'] or None, "{:.3f}")
+        net_delta_str = _fmt(net_delta, "{:+.3f}")
         
         if net_credit >= 0:
             net_str = f"${net_credit:,.2f}"
         else:
             net_str = f"-${abs(net_credit):,.2f}"
         
-        eff_str = f"{premium_eff:.1f}%" if not math.isnan(premium_eff) else "N/A"
-        roi_str = f"{capital_roi:.2f}%" if not math.isnan(capital_roi) else "N/A"
-        ann_str = f"{ann_roi:.1f}%" if not math.isnan(ann_roi) else "N/A"
+        eff_str = f"{premium_eff:.1f}%"
+        roi_str = f"{capital_roi:.2f}%"
+        ann_str = f"{ann_roi:.1f}%"
         
         # Calculate dollars per day of time (net credit / DTE)
-        if data['dte'] > 0 and not math.isnan(net_credit):
-            per_dte = net_credit / data['dte']
-            per_dte_str = f"${per_dte:.3f}"
-        else:
-            per_dte_str = "N/A"
+        per_dte_str = f"${net_credit / days:.3f}" if days > 0 else "N/A"
         
         # Format total cash generated
-        total_str = f"${total_income:,.0f}" if not math.isnan(total_income) else "N/A"
+        total_str = f"${total_income:,.0f}"
         
-        # Apply color based on Premium Efficiency
-        if use_colors and not math.isnan(premium_eff):
-            color = get_roi_color(premium_eff)
-            reset = Colors.RESET
-        else:
-            color = ""
-            reset = ""
-        
-        print(f"{color}{opt['type']:<20} {data['strike']:>8,.2f} {data['expiry']:<12} {data['dte']:>4} "
-              f"{new_delta_str:>7} {net_delta_str:>7} ${data['mark']:>7,.2f} {net_str:>8} {total_str:>10} {eff_str:>6} {roi_str:>6} {ann_str:>6} {per_dte_str:>8}{reset}")
+        out.append(row_template(premium_eff).format_map({
+            'typ': opt['type'], 'strike': data['strike'], 'expiry': data['expiry'], 'dte': days,
+            'new_delta': new_delta_str, 'net_delta': net_delta_str, 'mark': data['mark'],
+            'net': net_str, 'total': total_str, 'eff': eff_str, 'roi': roi_str, 'ann': ann_str,
+            'per_dte': per_dte_str,
+        }))
+    
+    out.append(_HR_EQ)
     
-    print("="*150)
+    _write(out, file)
 
-def print_legend(use_colors):
-    # Print legend
+
+def _write(lines, file):
+    """Write lines to file (default: sys.stdout) in one call and flush."""
+    if file is None:
+        file = sys.stdout
+    file.write("\n".join(lines) + "\n")
+    file.flush()
+
+
+def print_legend(use_colors, file=None):
+    """
+    Print the color and column guides with a timestamp.
+    
+    Args:
+        use_colors: Whether to include the color guide
+        file: Stream to write to (default: sys.stdout)
+    """
+    out = []
     if use_colors:
-        print(f"\n{Colors.BOLD}Color Guide:{Colors.RESET} Based on Premium Efficiency (Eff%)")
-        print(f"  {Colors.EXCELLENT}■{Colors.RESET} Excellent (≥90%)  "
-              f"{Colors.GOOD}■{Colors.RESET} Good (≥75%)  "
-              f"{Colors.MODERATE}■{Colors.RESET} Moderate (≥50%)  "
-              f"{Colors.POOR}■{Colors.RESET} Poor (>0%)  "
-              f"{Colors.NEGATIVE}■{Colors.RESET} Negative (≤0%)")
+        out.append(f"\n{Colors.BOLD}Color Guide:{Colors.RESET} Based on Premium Efficiency (Eff%)")
+        out.append(f"  {Colors.EXCELLENT}■{Colors.RESET} Excellent (≥90%)  "
+                   f"{Colors.GOOD}■{Colors.RESET} Good (≥75%)  "
+                   f"{Colors.MODERATE}■{Colors.RESET} Moderate (≥50%)  "
+                   f"{Colors.POOR}■{Colors.RESET} Poor (>0%)  "
+                   f"{Colors.NEGATIVE}■{Colors.RESET} Negative (≤0%)")
     
-    print(f"\n{Colors.BOLD}Column Guide:{Colors.RESET}")
-    print(f"  Total $  = Total Cash Generated: Net × Contracts × 100")
-    print(f"  Eff%  = Premium Efficiency: (Net / New Premium) - Shows roll deal quality")
-    print(f"  ROI%  = Return on Capital: (Net / Current Strike) - Shows earnings per period")
-    print(f"  Ann%  = Annualized ROI: ROI% × (365 / DTE) - Projected annual return")
-    print(f"  Note: Sorted by Capital ROI (highest earnings first)")
+    out.append(f"\n{Colors.BOLD}Column Guide:{Colors.RESET}")
+    out.append("  Total $  = Total Cash Generated: Net × Contracts × 100")
+    out.append("  Eff%  = Premium Efficiency: (Net / New Premium) - Shows roll deal quality")
+    out.append("  ROI%  = Return on Capital: (Net / Current Strike) - Shows earnings per period")
+    out.append("  Ann%  = Annualized ROI: ROI% × (365 / DTE) - Projected annual return")
+    out.append("  Note: Sorted by Capital ROI (highest earnings first)")
     
-    print(f"\nTimestamp: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
-    print("="*150 + "\n")
+    out.append(f"\nTimestamp: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    out.append(_HR_EQ + "\n")
+    _write(out, file)
 
 
-def print_positions_summary(positions):
+def print_positions_summary(positions, file=None):
     """
     Print summary of current positions.
     
     Args:
         positions: List of position dictionaries
+        file: Stream to write to (default: sys.stdout)
     """
-    import math
-    
     if not positions:
-        print("  No short option positions found\n")
+        _write(["  No short option positions found\n"], file)
         return
     
-    print(f"\n{'Symbol':<8} {'Type':<4} {'Strike':>8} {'Expiry':<10} {'DTE':>4} {'Qty':>4} {'Entry$':>8} {'Current$':>8} {'P&L$':>8}")
-    print("-" * 85)
+    out = []
+    out.append(f"\n{'Symbol':<8} {'Type':<4} {'Strike':>8} {'Expiry':<10} {'DTE':>4} {'Qty':>4} {'Entry$':>8} {'Current$':>8} {'P&L$':>8}")
+    out.append(_HR_DASH_SUMMARY)
     for pos in positions:
         current_dte = dte(pos['expiry'])
         position_type = pos.get('right', 'C')  # 'C' or 'P'
         
         # Handle NaN in current_mark
         current_mark = pos.get('current_mark')
-        if current_mark is None or (isinstance(current_mark, float) and math.isnan(current_mark)):
+        if is_missing(current_mark):
             mark_str = "N/A"
             pnl = float('nan')  # Can't calculate P&L without current mark
         else:
@@ -198,11 +268,13 @@ def print_positions_summary(positions):
             pnl = pos['entry_credit'] - current_mark
         
         # Handle NaN in P&L display
-        if isinstance(pnl, float) and math.isnan(pnl):
+        if is_missing(pnl):
             pnl_str = "N/A"
         else:
             pnl_str = f"{pnl:8,.2f}"
         
-        print(f"{pos['symbol']:<8} {position_type:^4} {pos['strike']:>8,.2f} {pos['expiry']:<10} {current_dte:>4} {pos['contracts']:>4} "
-              f"{pos['entry_credit']:>8,.2f} {mark_str:>8} {pnl_str:>8}")
-    print()
+        out.append(f"{pos['symbol']:<8} {position_type:^4} {pos['strike']:>8,.2f} {pos['expiry']:<10} {current_dte:>4} {pos['contracts']:>4} "
+                   f"{pos['entry_credit']:>8,.2f} {mark_str:>8} {pnl_str:>8}")
+    out.append("")
+    
+    _write(out, file)
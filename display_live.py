@@ -3,58 +3,170 @@ Live monitoring display using Rich library.
 Provides real-time updating tables for position and roll monitoring.
 """
 from datetime import datetime, timezone
+from functools import partial
+import heapq
 from rich.live import Live
 from rich.table import Table
 from rich.layout import Layout
 from rich.panel import Panel
 from rich.console import Console
 from rich.text import Text
-from utils import dte
-import math
+from utils import dte, is_missing
+
+
+def _num(value, default=0):
+    """Return value, or default if it is None or NaN."""
+    return default if is_missing(value) else value
+
+
+def _fmt(value, formatter, default="N/A"):
+    """Format a possibly-missing number with a bound str.format formatter."""
+    return default if is_missing(value) else formatter(value)
+
+
+# Pre-bound formatters for _fmt (skips the .format lookup on every cell)
+_DELTA3 = "{:.3f}".format
+_MONEY2 = "${:.2f}".format
+
+
+_utc_now = partial(datetime.now, timezone.utc)
+
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S UTC'
+# Last formatted "Last Update" second; the countdown re-renders every
+# second with an unchanged timestamp, so the string is usually reusable
+_last_ts_second = None
+_last_ts_str = ""
+
+
+def _format_timestamp(timestamp):
+    """Format a status timestamp, reusing the previous string within the same second."""
+    global _last_ts_second, _last_ts_str
+    second = int(timestamp.timestamp())
+    if second != _last_ts_second:
+        _last_ts_str = timestamp.strftime(_TIMESTAMP_FORMAT)
+        _last_ts_second = second
+    return _last_ts_str
+
+
+# Premium-efficiency thresholds (checked in order, inclusive) and their styles
+_ROI_STYLE_THRESHOLDS = (
+    (90.0, "bright_green"),
+    (75.0, "green"),
+    (50.0, "yellow"),
+)
 
 
 def get_roi_style(roi):
     """Get Rich style based on ROI percentage."""
-    if roi >= 90.0:
-        return "bright_green"
-    elif roi >= 75.0:
-        return "green"
-    elif roi >= 50.0:
-        return "yellow"
-    elif roi > 0:
-        return "red"
-    else:
-        return "dark_red"
+    for threshold, style in _ROI_STYLE_THRESHOLDS:
+        if roi >= threshold:
+            return style
+    # > 0% is poor; <= 0% (and NaN) is negative
+    return "red" if roi > 0 else "dark_red"
+
+
+# Static column layouts: (header, add_column keyword arguments)
+_POSITION_COLUMNS = (
+    ("Symbol", {"style": "cyan", "width": 8}),
+    ("Type", {"width": 5, "justify": "center"}),
+    ("Strike", {"justify": "right", "width": 9}),
+    ("Expiry", {"width": 11}),
+    ("DTE", {"justify": "right", "width": 4}),
+    ("Delta", {"justify": "right", "width": 7}),
+    ("Current $", {"justify": "right", "width": 9}),
+    ("P&L", {"justify": "right", "width": 10}),
+)
+
+_ROLL_COLUMNS = (
+    ("Roll", {"width": 16}),
+    ("Strike", {"justify": "right", "width": 8}),
+    ("Expiry", {"width": 10}),
+    ("DTE", {"justify": "right", "width": 4}),
+    ("Qty", {"justify": "right", "width": 4}),
+    ("NewΔ", {"justify": "right", "width": 7}),
+    ("NetΔ", {"justify": "right", "width": 7}),
+    ("Roll $", {"justify": "right", "width": 7}),  # Roll price (premium)
+    ("Net $", {"justify": "right", "width": 8}),
+    ("Total $", {"justify": "right", "width": 9}),
+    ("Eff%", {"justify": "right", "width": 6}),
+    ("ROI%", {"justify": "right", "width": 6}),
+    ("Ann%", {"justify": "right", "width": 6}),
+    ("$/DTE", {"justify": "right", "width": 7}),
+)
+
+
+def _add_columns(table, columns):
+    """Add a static column layout to a table."""
+    for header, options in columns:
+        table.add_column(header, **options)
+
+
+def _row_metrics(opt, days, multiplier):
+    """
+    Clean a roll option's numbers and derive its per-row totals in one call.
+    
+    Args:
+        opt: Roll option dict
+        days: Days to expiry of the new option
+        multiplier: Contracts x 100 for the position
+    
+    Returns:
+        (net_credit, net_delta, premium_eff, capital_roi, ann_roi, total_income, per_dte)
+        with missing values (None/NaN/inf) as 0; per_dte is None when days <= 0
+    """
+    net_credit, net_delta, premium_eff, capital_roi, ann_roi = [
+        0 if is_missing(value) else value
+        for value in (opt['net_credit'], opt.get('net_delta', 0), opt.get('premium_efficiency', 0),
+                      opt.get('capital_roi', 0), opt.get('annualized_roi', 0))
+    ]
+    per_dte = net_credit / days if days > 0 else None
+    return (net_credit, net_delta, premium_eff, capital_roi, ann_roi,
+            net_credit * multiplier, per_dte)
+
+
+def _make_roll_table(title):
+    """Create an empty roll opportunities table with the standard roll columns."""
+    table = Table(
+        title=title,
+        show_header=True,
+        header_style="bold magenta",
+        border_style="green",
+        show_lines=False,
+        padding=(0, 1)
+    )
+    # Columns (without Symbol and Current - they're in the title)
+    _add_columns(table, _ROLL_COLUMNS)
+    return table
 
 
 def create_status_panel(status_info):
     """Create status panel with connection and market info."""
-    status_text = Text()
+    # Collect (text, style) fragments and build the Text in one go
+    parts = []
     
     # Connection status
     if status_info.get('connected'):
-        status_text.append("● ", style="bright_green")
-        status_text.append(f"Connected to TWS ({status_info['host']}:{status_info['port']})", style="green")
+        parts.append(("● ", "bright_green"))
+        parts.append((f"Connected to TWS ({status_info['host']}:{status_info['port']})", "green"))
     else:
-        status_text.append("● ", style="red")
-        status_text.append("Disconnected", style="red")
+        parts.append(("● ", "red"))
+        parts.append(("Disconnected", "red"))
     
-    status_text.append("  |  ", style="dim")
+    parts.append(("  |  ", "dim"))
     
     # Market status
     market_status = status_info.get('market_status', {})
+    parts.append(("Market: ", "dim"))
     if market_status.get('is_open'):
-        status_text.append("Market: ", style="dim")
-        status_text.append("OPEN", style="bright_green bold")
+        parts.append(("OPEN", "bright_green bold"))
     else:
-        status_text.append("Market: ", style="dim")
-        status_text.append("CLOSED", style="red")
-        status_text.append(f" ({market_status.get('reason', 'Unknown')})", style="dim")
+        parts.append(("CLOSED", "red"))
+        parts.append((f" ({market_status.get('reason', 'Unknown')})", "dim"))
     
     # Cache statistics
     cache_stats = status_info.get('cache_stats')
     if cache_stats:
-        status_text.append("  |  ", style="dim")
+        parts.append(("  |  ", "dim"))
         hit_rate = cache_stats.get('hit_rate', 0)
         hits = cache_stats.get('hits', 0)
         total = cache_stats.get('total_requests', 0)
@@ -64,29 +176,29 @@ def create_status_panel(status_info):
             style = "yellow"
         else:
             style = "red"
-        status_text.append(f"Cache: {hit_rate:.0f}%", style=style)
-        status_text.append(f" ({hits}/{total})", style="dim")
+        parts.append((f"Cache: {hit_rate:.0f}%", style))
+        parts.append((f" ({hits}/{total})", "dim"))
     
     # Activity status
     activity = status_info.get('activity')
     if activity:
-        status_text.append("  |  ", style="dim")
-        status_text.append(f"[{activity}]", style="yellow bold")
+        parts.append(("  |  ", "dim"))
+        parts.append((f"[{activity}]", "yellow bold"))
     
-    status_text.append("\n")
+    parts.append("\n")
     
     # Timestamp
-    timestamp = status_info.get('timestamp', datetime.now(timezone.utc))
-    status_text.append(f"Last Update: {timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}", style="dim")
+    timestamp = status_info.get('timestamp') or _utc_now()
+    parts.append((f"Last Update: {_format_timestamp(timestamp)}", "dim"))
     
     # Next check countdown
     if status_info.get('next_check_seconds'):
-        status_text.append(f"  |  Next Check: {status_info['next_check_seconds']}s", style="dim")
+        parts.append((f"  |  Next Check: {status_info['next_check_seconds']}s", "dim"))
     
-    status_text.append("\n")
-    status_text.append("Press 'q' to quit", style="dim italic")
+    parts.append("\n")
+    parts.append(("Press 'q' to quit", "dim italic"))
     
-    return Panel(status_text, title="📊 Options Roll Monitor", border_style="cyan", padding=(0, 1))
+    return Panel(Text.assemble(*parts), title="📊 Options Roll Monitor", border_style="cyan", padding=(0, 1))
 
 
 def create_positions_table(positions):
@@ -99,14 +211,7 @@ def create_positions_table(positions):
         show_lines=False
     )
     
-    table.add_column("Symbol", style="cyan", width=8)
-    table.add_column("Type", width=5, justify="center")
-    table.add_column("Strike", justify="right", width=9)
-    table.add_column("Expiry", width=11)
-    table.add_column("DTE", justify="right", width=4)
-    table.add_column("Delta", justify="right", width=7)
-    table.add_column("Current $", justify="right", width=9)
-    table.add_column("P&L", justify="right", width=10)
+    _add_columns(table, _POSITION_COLUMNS)
     
     if not positions:
         table.add_row("—", "—", "—", "—", "—", "—", "—", "—")
@@ -116,29 +221,23 @@ def create_positions_table(positions):
         current_dte = dte(pos['expiry'])
         position_type = pos.get('right', 'C')
         
-        # Handle NaN in current_mark
+        # Handle NaN in current_mark; without a mark there is no P&L either,
+        # so only a computed P&L needs its own NaN check
         current_mark = pos.get('current_mark')
-        if current_mark is None or (isinstance(current_mark, float) and math.isnan(current_mark)):
+        pnl_str = "N/A"
+        pnl_style = ""
+        if is_missing(current_mark):
             mark_str = "N/A"
-            pnl = float('nan')
         else:
             mark_str = f"${current_mark:.2f}"
             pnl = pos['entry_credit'] - current_mark
-        
-        # Handle NaN in P&L display
-        if isinstance(pnl, float) and math.isnan(pnl):
-            pnl_str = "N/A"
-            pnl_style = ""
-        else:
-            pnl_str = f"${pnl:.2f}"
-            pnl_style = "green" if pnl > 0 else "red" if pnl < 0 else ""
+            if not is_missing(pnl):
+                pnl_str = f"${pnl:.2f}"
+                pnl_style = "green" if pnl > 0 else "red" if pnl < 0 else ""
         
         # Delta display
         current_delta = pos.get('current_delta')
-        if current_delta is not None and not math.isnan(current_delta):
-            delta_str = f"{current_delta:.3f}"
-        else:
-            delta_str = "N/A"
+        delta_str = _fmt(current_delta, _DELTA3)
         
         # DTE color coding
         if current_dte <= 7:
@@ -153,43 +252,32 @@ def create_positions_table(positions):
             position_type,
             f"${pos['strike']:.2f}",
             pos['expiry'],
-            Text(str(current_dte), style=dte_style),
+            f"[{dte_style}]{current_dte}[/]",
             delta_str,
             mark_str,
-            Text(pnl_str, style=pnl_style)
+            f"[{pnl_style}]{pnl_str}[/]" if pnl_style else pnl_str
         )
     
     return table
 
 
-def create_roll_opportunities_table(roll_data, max_rolls_per_position=3):
+def _build_roll_snapshot(roll_data, max_rolls_per_position=3):
     """
-    Create grouped tables showing roll opportunities by position.
+    Precompute everything the roll tables show, ready to render.
+    
+    Sorting, NaN cleanup, row styles and cell formatting all happen here,
+    so rendering is just adding prebuilt rows to tables, and two snapshots
+    compare equal exactly when the tables would look the same.
     
     Args:
         roll_data: List of position roll opportunities
         max_rolls_per_position: Max rolls to show per position (0 = all)
     
     Returns:
-        Layout with separate table for each position
+        Tuple of (title, rows, caption) per position, where rows is a tuple
+        of cell-string tuples and caption is None if all rolls are shown
     """
-    from rich.layout import Layout
-    from rich.panel import Panel
-    
-    if not roll_data:
-        # Empty state
-        table = Table(
-            title="Roll Opportunities",
-            show_header=True,
-            header_style="bold magenta",
-            border_style="green",
-        )
-        table.add_column("Message", style="dim")
-        table.add_row("No roll opportunities found")
-        return table
-    
-    # Create a layout to hold all position tables
-    tables = []
+    snapshot = []
     
     for position_roll in roll_data:
         symbol = position_roll['symbol']
@@ -202,35 +290,37 @@ def create_roll_opportunities_table(roll_data, max_rolls_per_position=3):
         # Determine target delta based on position type
         target_delta = 0.10 if right == 'C' else -0.90
         
-        # Sort options by delta closeness to target (primary), then ROI (secondary)
-        def sort_key(opt):
-            delta = opt['data'].get('delta', 0)
-            roi = opt.get('capital_roi', 0)
-            
-            # Handle NaN values
-            if delta is None or math.isnan(delta):
-                delta_distance = 999  # Push to end
+        target_abs = abs(target_delta)
+        
+        # Sort options by delta closeness to target (primary), then ROI (secondary).
+        # Options with a missing delta always sort after the rest, so split them
+        # off once and keep the NaN checks out of the sort keys.
+        with_delta = []
+        without_delta = []
+        for opt in options:
+            if is_missing(opt['data'].get('delta', 0)):
+                without_delta.append(opt)
             else:
-                # Distance from target delta
-                delta_distance = abs(abs(delta) - abs(target_delta))
-            
-            if roi is None or math.isnan(roi):
-                roi = -999
-            
-            # Primary sort: delta closeness (smaller distance = better)
-            # Secondary sort: ROI (higher = better)
+                with_delta.append(opt)
+        
+        def roi_key(opt):
             # Negative ROI to sort descending
-            return (delta_distance, -roi)
+            return -_num(opt.get('capital_roi', 0), -999)
         
-        sorted_options = sorted(options, key=sort_key)
+        def sort_key(opt):
+            # Distance from target delta (smaller = better), then ROI (higher = better)
+            return (abs(abs(opt['data'].get('delta', 0)) - target_abs), roi_key(opt))
         
-        # Limit to top N
-        total_rolls = len(sorted_options)
+        # Limit to top N (nsmallest == sorted()[:n] without sorting the rest)
+        total_rolls = len(options)
         if max_rolls_per_position > 0:
-            display_options = sorted_options[:max_rolls_per_position]
+            display_options = heapq.nsmallest(max_rolls_per_position, with_delta, key=sort_key)
+            if len(display_options) < max_rolls_per_position:
+                display_options += heapq.nsmallest(
+                    max_rolls_per_position - len(display_options), without_delta, key=roi_key)
             remaining = total_rolls - max_rolls_per_position
         else:
-            display_options = sorted_options
+            display_options = sorted(with_delta, key=sort_key) + sorted(without_delta, key=roi_key)
             remaining = 0
         
         # Create title showing position info
@@ -240,52 +330,19 @@ def create_roll_opportunities_table(roll_data, max_rolls_per_position=3):
         else:
             title += f" → {total_rolls} roll(s)"
         
-        # Create table for this position
-        table = Table(
-            title=title,
-            show_header=True,
-            header_style="bold magenta",
-            border_style="green",
-            show_lines=False,
-            padding=(0, 1)
-        )
-        
-        # Columns (without Symbol and Current - they're in the title)
-        table.add_column("Roll", width=16)
-        table.add_column("Strike", justify="right", width=8)
-        table.add_column("Expiry", width=10)
-        table.add_column("DTE", justify="right", width=4)
-        table.add_column("Qty", justify="right", width=4)
-        table.add_column("NewΔ", justify="right", width=7)
-        table.add_column("NetΔ", justify="right", width=7)
-        table.add_column("Roll $", justify="right", width=7)  # NEW: Roll price (premium)
-        table.add_column("Net $", justify="right", width=8)
-        table.add_column("Total $", justify="right", width=9)
-        table.add_column("Eff%", justify="right", width=6)
-        table.add_column("ROI%", justify="right", width=6)
-        table.add_column("Ann%", justify="right", width=6)
-        table.add_column("$/DTE", justify="right", width=7)
+        # Per-position values shared by every row
+        multiplier = contracts * 100
+        qty_str = str(int(contracts))
         
-        # Add rows
+        # Build rows
+        rows = []
         for idx, opt in enumerate(display_options):
             data = opt['data']
-            net_credit = opt['net_credit']
-            net_delta = opt.get('net_delta', 0)
-            premium_eff = opt.get('premium_efficiency', 0)
-            capital_roi = opt.get('capital_roi', 0)
-            ann_roi = opt.get('annualized_roi', 0)
+            days = data.get('dte', 0)
             
-            # Handle NaN values
-            if net_credit is None or math.isnan(net_credit):
-                net_credit = 0
-            if net_delta is None or math.isnan(net_delta):
-                net_delta = 0
-            if premium_eff is None or math.isnan(premium_eff):
-                premium_eff = 0
-            if capital_roi is None or math.isnan(capital_roi):
-                capital_roi = 0
-            if ann_roi is None or math.isnan(ann_roi):
-                ann_roi = 0
+            # Handle NaN values and derive the per-row totals
+            (net_credit, net_delta, premium_eff, capital_roi, ann_roi,
+             total_income, per_dte) = _row_metrics(opt, days, multiplier)
             
             # Format roll option name (with star for best delta match)
             roll_name = opt['type']
@@ -293,60 +350,82 @@ def create_roll_opportunities_table(roll_data, max_rolls_per_position=3):
                 roll_name = f"★ {roll_name}"
             
             # New delta
-            new_delta = data.get('delta', 0)
-            new_delta_str = f"{new_delta:.3f}" if new_delta is not None and not math.isnan(new_delta) else "N/A"
+            new_delta_str = _fmt(data.get('delta', 0), _DELTA3)
             
             # Net delta change
-            net_delta_str = f"{net_delta:+.3f}" if not math.isnan(net_delta) else "N/A"
+            net_delta_str = f"{net_delta:+.3f}"
             
             # Roll price (premium of new option)
-            roll_price = data.get('mark', 0)
-            roll_price_str = f"${roll_price:.2f}" if roll_price is not None and not math.isnan(roll_price) else "N/A"
+            roll_price_str = _fmt(data.get('mark', 0), _MONEY2)
             
             # Net credit
             net_str = f"${net_credit:.2f}" if net_credit >= 0 else f"-${abs(net_credit):.2f}"
             
             # Total cash generated
-            total_income = net_credit * contracts * 100
-            total_str = f"${total_income:,.0f}" if not math.isnan(total_income) else "N/A"
+            total_str = f"${total_income:,.0f}"
             
             # Percentages
-            eff_str = f"{premium_eff:.1f}%" if not math.isnan(premium_eff) else "N/A"
-            roi_str = f"{capital_roi:.2f}%" if not math.isnan(capital_roi) else "N/A"
-            ann_str = f"{ann_roi:.1f}%" if not math.isnan(ann_roi) else "N/A"
+            eff_str = f"{premium_eff:.1f}%"
+            roi_str = f"{capital_roi:.2f}%"
+            ann_str = f"{ann_roi:.1f}%"
             
             # Dollars per DTE
-            dte = data.get('dte', 0)
-            if dte > 0 and not math.isnan(net_credit):
-                per_dte = net_credit / dte
-                per_dte_str = f"${per_dte:.3f}"
-            else:
-                per_dte_str = "N/A"
+            per_dte_str = "N/A" if per_dte is None else f"${per_dte:.3f}"
             
             # Get style based on premium efficiency
             row_style = get_roi_style(premium_eff)
             
-            table.add_row(
-                Text(roll_name, style=row_style),
+            rows.append((
+                f"[{row_style}]{roll_name}[/]",
                 f"${data['strike']:.2f}",
                 data['expiry'],
-                str(data['dte']),
-                str(int(contracts)),
-                Text(new_delta_str, style=row_style),
-                Text(net_delta_str, style=row_style),
-                Text(roll_price_str, style=row_style),  # NEW: Roll price
-                Text(net_str, style=row_style),
-                Text(total_str, style=row_style),
-                Text(eff_str, style=row_style),
-                Text(roi_str, style=row_style),
-                Text(ann_str, style=row_style),
-                Text(per_dte_str, style=row_style)
-            )
+                str(days),
+                qty_str,
+                f"[{row_style}]{new_delta_str}[/]",
+                f"[{row_style}]{net_delta_str}[/]",
+                f"[{row_style}]{roll_price_str}[/]",
+                f"[{row_style}]{net_str}[/]",
+                f"[{row_style}]{total_str}[/]",
+                f"[{row_style}]{eff_str}[/]",
+                f"[{row_style}]{roi_str}[/]",
+                f"[{row_style}]{ann_str}[/]",
+                f"[{row_style}]{per_dte_str}[/]"
+            ))
         
         # Add footer if there are more rolls
-        if remaining > 0:
-            table.caption = f"[dim]... {remaining} more roll(s) available[/dim]"
+        caption = f"[dim]... {remaining} more roll(s) available[/dim]" if remaining > 0 else None
         
+        snapshot.append((title, tuple(rows), caption))
+    
+    return tuple(snapshot)
+
+
+def _render_roll_snapshot(snapshot):
+    """
+    Render a roll snapshot from _build_roll_snapshot() as Rich tables.
+    
+    Returns:
+        Table for a single position, Layout with one table per position otherwise
+    """
+    if not snapshot:
+        # Empty state
+        table = Table(
+            title="Roll Opportunities",
+            show_header=True,
+            header_style="bold magenta",
+            border_style="green",
+        )
+        table.add_column("Message", style="dim")
+        table.add_row("No roll opportunities found")
+        return table
+    
+    tables = []
+    for title, rows, caption in snapshot:
+        table = _make_roll_table(title)
+        for row in rows:
+            table.add_row(*row)
+        if caption:
+            table.caption = caption
         tables.append(table)
     
     # If only one position, return the table directly
@@ -356,11 +435,26 @@ def create_roll_opportunities_table(roll_data, max_rolls_per_position=3):
     # Multiple positions - create layout with all tables
     # Stack them vertically
     layout = Layout()
-    layout.split_column(*[Layout(t, size=len(display_options) + 4) for t in tables])
+    # Each sized by its own position's row count
+    layout.split_column(*[Layout(t, size=len(rows) + 4) for (_, rows, _), t in zip(snapshot, tables)])
     
     return layout
 
 
+def create_roll_opportunities_table(roll_data, max_rolls_per_position=3):
+    """
+    Create grouped tables showing roll opportunities by position.
+    
+    Args:
+        roll_data: List of position roll opportunities
+        max_rolls_per_position: Max rolls to show per position (0 = all)
+    
+    Returns:
+        Layout with separate table for each position
+    """
+    return _render_roll_snapshot(_build_roll_snapshot(roll_data, max_rolls_per_position))
+
+
 def create_summary_panel(summary_info):
     """Create summary panel with statistics."""
     text = Text()
@@ -390,22 +484,30 @@ def create_summary_panel(summary_info):
     return Panel(text, title="Summary", border_style="dim", padding=(0, 1))
 
 
-def create_full_display(display_data, max_rolls_per_position=3):
-    """Create the complete display layout."""
+def create_full_display(display_data, max_rolls_per_position=3, roll_content=None):
+    """
+    Create the complete display layout.
+    
+    Args:
+        display_data: Status, roll opportunity and summary data
+        max_rolls_per_position: Max rolls to show per position (0 = all)
+        roll_content: Pre-built roll opportunities renderable to reuse (optional)
+    """
     layout = Layout()
     
     # Create panels
     status_panel = create_status_panel(display_data['status'])
     # NOTE: Positions table removed - info is shown in roll opportunity headers
-    roll_content = create_roll_opportunities_table(display_data['roll_opportunities'], max_rolls_per_position)
+    if roll_content is None:
+        roll_content = create_roll_opportunities_table(display_data['roll_opportunities'], max_rolls_per_position)
     summary_panel = create_summary_panel(display_data['summary'])
     
     # Build layout (without positions table to save vertical space)
     # Roll content might be a Layout (multiple tables) or a single Table
     layout.split_column(
-        Layout(status_panel, size=5),
+        Layout(status_panel, name="status", size=5),
         Layout(roll_content, name="rolls"),
-        Layout(summary_panel, size=3),
+        Layout(summary_panel, name="summary", size=3),
     )
     
     return layout
@@ -425,7 +527,7 @@ class LiveMonitor:
                 'host': 'N/A',
                 'port': 'N/A',
                 'market_status': {},
-                'timestamp': datetime.now(timezone.utc),
+                'timestamp': _utc_now(),
                 'next_check_seconds': None,
                 'activity': None
             },
@@ -438,6 +540,14 @@ class LiveMonitor:
                 'errors': 0
             }
         }
+        # Roll tables only change when roll data does, not on every status tick
+        self._roll_snapshot = ()
+        self._roll_content = None
+        # Full layout from the first render; later renders only swap regions
+        self._layout = None
+        self._summary_stale = True
+        # Set by update_* calls, cleared by render(); lets refresh() coalesce updates
+        self._dirty = True
     
     def update_status(self, connected=None, host=None, port=None, market_status=None, next_check_seconds=None, activity=None, cache_stats=None):
         """Update status information."""
@@ -455,15 +565,24 @@ class LiveMonitor:
             self.display_data['status']['activity'] = activity
         if cache_stats is not None:
             self.display_data['status']['cache_stats'] = cache_stats
-        self.display_data['status']['timestamp'] = datetime.now(timezone.utc)
+        self.display_data['status']['timestamp'] = _utc_now()
+        self._dirty = True
     
     def update_positions(self, positions):
         """Update positions data."""
         self.display_data['positions'] = positions
+        self._dirty = True
     
     def update_roll_opportunities(self, roll_opportunities):
         """Update roll opportunities data."""
         self.display_data['roll_opportunities'] = roll_opportunities
+        # Sort and format once here; render() only lays out the prebuilt rows
+        snapshot = _build_roll_snapshot(roll_opportunities, self.max_rolls_per_position)
+        if snapshot != self._roll_snapshot:
+            # Only rebuild the tables if something that is displayed changed
+            self._roll_snapshot = snapshot
+            self._roll_content = None
+            self._dirty = True
     
     def update_summary(self, positions_count=0, options_found=0, skipped_expiring=0, errors=0):
         """Update summary statistics."""
@@ -473,7 +592,57 @@ class LiveMonitor:
             'skipped_expiring': skipped_expiring,
             'errors': errors
         }
+        self._summary_stale = True
+        self._dirty = True
     
     def render(self):
-        """Render the current display."""
-        return create_full_display(self.display_data, self.max_rolls_per_position)
+        """
+        Render the current display.
+        
+        The layout is built once and then reused: the status panel is
+        refreshed on every render, while the roll tables and summary panel
+        are only replaced when their data changed.
+        """
+        self._dirty = False
+        
+        if self._layout is None:
+            if self._roll_content is None:
+                self._roll_content = _render_roll_snapshot(self._roll_snapshot)
+            self._layout = create_full_display(self.display_data, self.max_rolls_per_position,
+                                               roll_content=self._roll_content)
+            self._summary_stale = False
+            return self._layout
+        
+        layout = self._layout
+        layout["status"].update(create_status_panel(self.display_data['status']))
+        if self._roll_content is None:
+            self._roll_content = _render_roll_snapshot(self._roll_snapshot)
+            layout["rolls"].update(self._roll_content)
+        if self._summary_stale:
+            layout["summary"].update(create_summary_panel(self.display_data['summary']))
+            self._summary_stale = False
+        return layout
+    
+    def has_updates(self):
+        """True if data changed since the last render()."""
+        return self._dirty
+    
+    def refresh(self, live):
+        """
+        Push pending updates to a Live display.
+        
+        Any number of update_* calls since the last render are coalesced
+        into a single render; nothing is done if nothing changed. The Live
+        is expected to run with auto_refresh=False, so the redraw is
+        requested explicitly here.
+        
+        Args:
+            live: Rich Live instance showing this monitor
+        
+        Returns:
+            True if the display was re-rendered
+        """
+        if not self.has_updates():
+            return False
+        live.update(self.render(), refresh=True)
+        return True
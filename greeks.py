@@ -0,0 +1,39 @@
+"""
+Black-Scholes Greeks computed locally.
+Used to estimate which strikes are near a target delta before asking IB
+for quotes; the deltas IB reports remain the ones that are displayed.
+"""
+from math import erf, log, sqrt
+
+# Annual risk-free rate assumed for estimates
+RISK_FREE_RATE = 0.04
+
+
+def estimate_deltas(spot, strikes, years, sigma, right='C', rate=RISK_FREE_RATE):
+    """
+    Black-Scholes deltas of European options (no dividends) across strikes.
+
+    Terms shared by every strike are computed once.
+
+    Args:
+        spot: Underlying price
+        strikes: Strike prices
+        years: Time to expiry in years
+        sigma: Implied volatility (annualized, e.g. 0.30)
+        right: 'C' for call or 'P' for put
+        rate: Risk-free rate (default: RISK_FREE_RATE)
+
+    Returns:
+        List of deltas in strike order (negative for puts)
+    """
+    offset = 0.0 if right == 'C' else -1.0
+    if years <= 0 or sigma <= 0:
+        # Expired or no volatility: intrinsic only
+        return [(1.0 if spot > k else 0.0) + offset for k in strikes]
+
+    vol_sqrt_t = sigma * sqrt(years)
+    drift = (rate + 0.5 * sigma * sigma) * years
+    log_spot = log(spot)
+    inv_sqrt2 = 1 / sqrt(2.0)
+    return [0.5 * (1.0 + erf((log_spot - log(k) + drift) / vol_sqrt_t * inv_sqrt2)) + offset
+            for k in strikes]
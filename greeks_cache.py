@@ -2,36 +2,64 @@
 Greeks caching system to reduce IB API calls.
 Caches option Greeks for a configurable TTL (time-to-live).
 """
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
+import sys
 import threading
+import time
+
+
+# Returned by GreeksCache.get() for keys recently recorded as unavailable
+# (see put_negative()); compare with "is"
+MISS = MappingProxyType({})
+
+
+def _intern(value):
+    """Intern strings; pass anything else (e.g. numeric strikes) through."""
+    return sys.intern(value) if type(value) is str else value
 
 
 class GreeksCache:
-    """Thread-safe cache for option Greeks data."""
+    """Thread-safe cache for option Greeks data (lock-free reads)."""
     
-    def __init__(self, ttl_seconds=60):
+    def __init__(self, ttl_seconds=60, max_size=2048):
         """
         Initialize Greeks cache.
         
         Args:
             ttl_seconds: Time-to-live for cached data in seconds (default: 60)
+            max_size: Maximum number of entries; least recently used entries
+                are evicted beyond this (default: 2048)
         """
         self.ttl_seconds = ttl_seconds
-        self.cache = {}  # key -> (data, timestamp)
+        self.max_size = max_size
+        # key -> (read-only data, monotonic timestamp), least recently used first
+        self.cache = OrderedDict()
+        # key -> (monotonic timestamp, TTL) of lookups that found no data
+        self.negative = {}
+        # Monotonic clock: cheap float reads, immune to wall-clock jumps
+        self._monotonic = time.monotonic
         self.lock = threading.Lock()
         self.stats = {
             'hits': 0,
             'misses': 0,
             'expired': 0,
+            'evicted': 0,
+            'negative_hits': 0,
             'total_requests': 0
         }
     
     def _make_key(self, symbol, expiry, strike, right):
-        """Create cache key from option parameters."""
-        return f"{symbol}_{expiry}_{strike}_{right}"
+        """
+        Create cache key from option parameters.
+        
+        A plain tuple: no string building per probe, and hashing reuses the
+        fields' own (cached) string hashes.
+        """
+        return (symbol, expiry, strike, right)
     
-    def get(self, symbol, expiry, strike, right) -> Optional[Dict[str, Any]]:
+    def get(self, symbol, expiry, strike, right, ttl_seconds=None) -> Optional[Mapping[str, Any]]:
         """
         Get cached Greeks data if available and not expired.
         
@@ -40,36 +68,60 @@ class GreeksCache:
             expiry: Option expiry (YYYYMMDD)
             strike: Strike price
             right: 'C' or 'P'
+            ttl_seconds: Max age for this lookup (default: the cache's TTL)
         
         Returns:
-            Cached data dict or None if not found/expired
+            Read-only view of the cached data, MISS if the data is known to
+            be unavailable (see put_negative()), or None if not found/expired
         """
-        self.stats['total_requests'] += 1
+        stats = self.stats
+        stats['total_requests'] += 1
         
         key = self._make_key(symbol, expiry, strike, right)
         
-        with self.lock:
-            if key not in self.cache:
-                self.stats['misses'] += 1
-                return None
-            
-            data, timestamp = self.cache[key]
-            age = datetime.now() - timestamp
-            
-            if age.total_seconds() > self.ttl_seconds:
-                # Expired - remove from cache
-                del self.cache[key]
-                self.stats['expired'] += 1
-                return None
-            
-            # Cache hit!
-            self.stats['hits'] += 1
-            return data.copy()  # Return copy to prevent modifications
+        # Lock-free fast path: a single dict lookup is atomic, and entries
+        # are immutable tuples, so readers never see a half-written value.
+        # Unlocked stat counters may undercount slightly under contention.
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        
+        entry = self.cache.get(key)
+        if entry is None:
+            negative = self.negative.get(key)
+            if negative is not None:
+                timestamp, negative_ttl = negative
+                if self._monotonic() - timestamp <= min(negative_ttl, ttl_seconds):
+                    stats['negative_hits'] += 1
+                    return MISS
+                self.negative.pop(key, None)
+            stats['misses'] += 1
+            return None
+        
+        data, timestamp = entry
+        
+        if self._monotonic() - timestamp > ttl_seconds:
+            # Expired - remove from cache (pop tolerates a concurrent removal)
+            self.cache.pop(key, None)
+            stats['expired'] += 1
+            return None
+        
+        # Cache hit! Mark as recently used (the entry may have just been
+        # evicted or expired by another thread, which is fine)
+        try:
+            self.cache.move_to_end(key)
+        except KeyError:
+            pass
+        stats['hits'] += 1
+        return data  # Read-only, so safe to share without copying
     
     def put(self, symbol, expiry, strike, right, data: Dict[str, Any]):
         """
         Store Greeks data in cache.
         
+        The data is snapshotted once into a read-only mapping, so later
+        changes to the caller's dict don't leak into the cache and hits
+        can be returned without copying.
+        
         Args:
             symbol: Underlying symbol
             expiry: Option expiry (YYYYMMDD)
@@ -77,29 +129,90 @@ class GreeksCache:
             right: 'C' or 'P'
             data: Greeks data dictionary
         """
+        # Stored keys are long-lived and heavily repeated; interning the
+        # strings lets equal probes match on identity
+        key = self._make_key(_intern(symbol), _intern(expiry), strike, _intern(right))
+        frozen = MappingProxyType(dict(data))
+        
+        with self.lock:
+            self.negative.pop(key, None)
+            cache = self.cache
+            if key in cache:
+                cache.move_to_end(key)
+            elif len(cache) >= self.max_size:
+                # Evict the least recently used entry
+                cache.popitem(last=False)
+                self.stats['evicted'] += 1
+            cache[key] = (frozen, self._monotonic())
+    
+    def put_negative(self, symbol, expiry, strike, right, ttl_seconds=30):
+        """
+        Record that no data is available for an option, for a short while.
+        
+        Until it expires, get() returns MISS for the key so callers can skip
+        repeating a lookup that just failed.
+        
+        Args:
+            symbol: Underlying symbol
+            expiry: Option expiry (YYYYMMDD)
+            strike: Strike price
+            right: 'C' or 'P'
+            ttl_seconds: How long to remember the miss (default: 30)
+        """
+        key = self._make_key(_intern(symbol), _intern(expiry), strike, _intern(right))
+        
+        with self.lock:
+            negative = self.negative
+            if key not in negative and len(negative) >= self.max_size:
+                # Drop the oldest recorded miss
+                del negative[next(iter(negative))]
+            negative[key] = (self._monotonic(), ttl_seconds)
+    
+    def discard(self, symbol, expiry, strike, right):
+        """
+        Remove an option's cached data and any recorded miss, if present.
+        
+        Args:
+            symbol: Underlying symbol
+            expiry: Option expiry (YYYYMMDD)
+            strike: Strike price
+            right: 'C' or 'P'
+        """
         key = self._make_key(symbol, expiry, strike, right)
         
         with self.lock:
-            self.cache[key] = (data.copy(), datetime.now())
+            self.cache.pop(key, None)
+            self.negative.pop(key, None)
     
     def clear(self):
         """Clear all cached data."""
         with self.lock:
             self.cache.clear()
+            self.negative.clear()
     
     def clear_expired(self):
         """Remove all expired entries from cache."""
-        now = datetime.now()
-        expired_keys = []
+        ttl = self.ttl_seconds
+        
+        # Snapshot under the lock so iteration can't race with put()
+        with self.lock:
+            entries = list(self.cache.items())
         
+        now = self._monotonic()
+        expired = [(key, entry) for key, entry in entries if now - entry[1] > ttl]
+        
+        expired_keys = []
         with self.lock:
-            for key, (data, timestamp) in self.cache.items():
-                age = now - timestamp
-                if age.total_seconds() > self.ttl_seconds:
+            for key, entry in expired:
+                # Skip keys that were refreshed since the snapshot
+                if self.cache.get(key) is entry:
+                    del self.cache[key]
                     expired_keys.append(key)
             
-            for key in expired_keys:
-                del self.cache[key]
+            negative = self.negative
+            for key in [key for key, (timestamp, negative_ttl) in negative.items()
+                        if now - timestamp > negative_ttl]:
+                del negative[key]
         
         return len(expired_keys)
     
@@ -123,6 +236,8 @@ class GreeksCache:
                 'hits': 0,
                 'misses': 0,
                 'expired': 0,
+                'evicted': 0,
+                'negative_hits': 0,
                 'total_requests': 0
             }
 
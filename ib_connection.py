@@ -36,6 +36,24 @@ def connect_ib(host="127.0.0.1", port=7496, client_id=2, readonly=True, realtime
     return ib
 
 
+def ensure_connected(ib, host="127.0.0.1", port=7496, client_id=2, readonly=True, realtime=False):
+    """
+    Reuse an existing connection, reconnecting only if it has dropped.
+    
+    Args:
+        ib: IB instance from a previous connect_ib() call, or None
+        host, port, client_id, readonly, realtime: As for connect_ib()
+    
+    Returns:
+        Connected IB instance (ib itself while it is still connected)
+    """
+    if ib is not None and ib.isConnected():
+        return ib
+    if ib is not None:
+        disconnect_ib(ib)
+    return connect_ib(host, port, client_id, readonly=readonly, realtime=realtime)
+
+
 def disconnect_ib(ib):
     """
     Safely disconnect from IBKR.
@@ -1,13 +1,155 @@
 """
 Market data and quote helpers.
 """
-from ib_insync import Ticker, Option, Stock
+from ib_insync import Ticker, util
+import asyncio
 import time
-from utils import FALLBACK_EXCHANGES
-from greeks_cache import get_cache
+from utils import FALLBACK_EXCHANGES, dte
+from greeks_cache import get_cache, MISS
+from contracts_pool import qualify_options_async, qualify_stock_async
 
+# Shared cache handle; per-call TTLs are passed to get() instead of
+# re-fetching the handle on every quote
+_CACHE = get_cache()
 
-def safe_mark(tk: Ticker, verbose=False):
+# How long a failed quote is remembered before IB is asked again (seconds)
+_NEGATIVE_TTL = 30
+
+# Fetches currently running, by key; concurrent misses for the same key wait
+# on the first caller's result instead of issuing duplicate IB requests
+_inflight = {}
+
+# Smoothed time (seconds) Greeks take to arrive once we start waiting. Greek
+# waits give up after a multiple of it rather than always sitting out the
+# caller's full timeout, so they track how fast the data farm currently is.
+_greeks_latency_ema = 0.5
+_LATENCY_ALPHA = 0.2
+_GREEKS_WAIT_FACTOR = 4.0
+_MIN_GREEKS_WAIT = 0.5
+
+# Market data subscriptions by conId -> [subscribing contract, ticker, users].
+# Concurrent quotes of the same contract share one subscription. ib_insync
+# finds a request by the contract object passed to reqMktData (not by conId),
+# so the cancel always uses the stored contract, whichever object the last
+# user holds (e.g. the SMART and CBOE versions of one option share a conId).
+_subscriptions = {}
+
+
+# Chain-definition strikes that failed to qualify while others in the same
+# batch did, by (symbol, expiry, right) -> (monotonic time first recorded, set
+# of strikes). Chain definitions list strikes across all expiries; these
+# aren't listed for this one, so batches skip them for a while. (A failed
+# request, e.g. pacing or a dropped connection, fails every leg and marks none.)
+_unlisted = {}
+_UNLISTED_TTL = 300
+
+
+# Exchange (options) / primary exchange (stocks) that last returned a quote,
+# per symbol; tried first next time
+_LAST_GOOD_EXCHANGE = {}
+_LAST_GOOD_PRIMARY = {}
+
+
+async def single_flight_async(key, fetch):
+    """
+    Run fetch() once per key at a time, sharing its result with concurrent callers.
+    
+    Args:
+        key: Identifies the request (e.g. the cache key)
+        fetch: Zero-argument coroutine function performing the request
+    
+    Returns:
+        fetch()'s result (re-raises its exception for every waiter)
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded so a caller timing out doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+def unlisted_strikes(symbol, expiry, right):
+    """
+    Strikes of an expiry that recently failed to qualify (not listed).
+    
+    Args:
+        symbol: Underlying symbol
+        expiry: Expiration date (YYYYMMDD)
+        right: 'C' for call or 'P' for put
+    
+    Returns:
+        Frozenset of strikes (empty if none are known)
+    """
+    entry = _unlisted.get((symbol, expiry, right))
+    if entry is None or time.monotonic() - entry[0] > _UNLISTED_TTL:
+        return frozenset()
+    return frozenset(entry[1])
+
+
+def clear_unlisted_strikes():
+    """Forget which strikes failed to qualify."""
+    _unlisted.clear()
+
+
+def _record_unlisted(symbol, expiry, right, strikes):
+    """Remember strikes that failed to qualify (see unlisted_strikes())."""
+    key = (symbol, expiry, right)
+    if not strikes:
+        return
+    entry = _unlisted.get(key)
+    if entry is None or time.monotonic() - entry[0] > _UNLISTED_TTL:
+        entry = _unlisted[key] = (time.monotonic(), set())
+    entry[1].update(strikes)
+
+
+def _subscribe(ib, contract, generic_ticks=''):
+    """Start (or share) a streaming market data subscription; returns the Ticker."""
+    entry = _subscriptions.get(contract.conId)
+    if entry is None:
+        entry = _subscriptions[contract.conId] = [contract, ib.reqMktData(contract, generic_ticks, False, False), 0]
+    entry[2] += 1
+    return entry[1]
+
+
+def _unsubscribe(ib, contract):
+    """Release a subscription from _subscribe(), cancelling it once unused."""
+    entry = _subscriptions.get(contract.conId)
+    if entry is None:
+        return
+    entry[2] -= 1
+    if entry[2] <= 0:
+        del _subscriptions[contract.conId]
+        try:
+            ib.cancelMktData(entry[0])
+        except Exception:
+            pass
+
+
+async def get_stock_contract_async(ib, symbol):
+    """
+    Get the qualified SMART-routed stock contract for a symbol.
+    
+    Args:
+        ib: Connected IB instance
+        symbol: Stock symbol
+    
+    Returns:
+        Qualified Stock contract, or None if it can't be qualified
+    """
+    try:
+        stk = await qualify_stock_async(ib, symbol)
+    except Exception:
+        return None
+    return stk if stk.conId else None
+
+
+def get_stock_contract(ib, symbol):
+    """Blocking version of get_stock_contract_async()."""
+    return util.run(get_stock_contract_async(ib, symbol))
+
+
+def safe_mark(tk: Ticker):
     """
     Calculate safe mark price from ticker.
     
@@ -15,36 +157,207 @@ def safe_mark(tk: Ticker, verbose=False):
     
     Args:
         tk: Ticker object
-        verbose: If True, print what data is available
     
     Returns:
         Mark price or None
     """
+    # Try bid-ask midpoint first (the common case: only two fields read)
     bid, ask = tk.bid, tk.ask
-    
-    if verbose:
-        print(f"    Ticker data - Bid: {bid}, Ask: {ask}, Last: {tk.last}, Close: {tk.close}")
-    
-    # Try bid-ask midpoint first
     if bid is not None and ask is not None and 0 < bid <= ask:
-        return (bid + ask) / 2
-    
-    # Try individual values
-    if bid is not None and bid > 0:
-        return bid
-    if ask is not None and ask > 0:
-        return ask
-    if tk.last is not None and tk.last > 0:
-        return tk.last
-    if tk.close is not None and tk.close > 0:
-        return tk.close
+        return (bid + ask) * 0.5
+    
+    # Try individual values, in order (NaN fails the > 0 test)
+    for value in (bid, ask, tk.last, tk.close):
+        if value is not None and value > 0:
+            return value
     
     return None
 
 
+def safe_mark_verbose(tk: Ticker):
+    """safe_mark() that first prints what data the ticker has."""
+    print(f"    Ticker data - Bid: {tk.bid}, Ask: {tk.ask}, Last: {tk.last}, Close: {tk.close}")
+    return safe_mark(tk)
+
+
+def _has_greeks(tk: Ticker):
+    """True once the ticker's model Greeks carry a delta."""
+    return tk.modelGreeks is not None and tk.modelGreeks.delta is not None
+
+
+def _has_quote(tk: Ticker):
+    """True once the ticker has a valid bid/ask pair (safe_mark's preferred price)."""
+    bid, ask = tk.bid, tk.ask
+    return bid is not None and ask is not None and 0 < bid <= ask
+
+
+async def _wait_for_any_async(tickers, is_ready, timeout):
+    """
+    Wait until is_ready(ticker) holds for any of the tickers.
+    
+    Resolves on the tickers' updateEvent as soon as the condition is met
+    instead of polling on a fixed interval.
+    
+    Returns:
+        True if the condition was met, False on timeout
+    """
+    if any(is_ready(tk) for tk in tickers):
+        return True
+    
+    ready = asyncio.get_running_loop().create_future()
+    
+    def on_update(tk, *args):
+        if not ready.done() and is_ready(tk):
+            ready.set_result(True)
+    
+    for tk in tickers:
+        tk.updateEvent += on_update
+    try:
+        return await asyncio.wait_for(ready, timeout)
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        for tk in tickers:
+            tk.updateEvent -= on_update
+
+
+async def _wait_for_all_async(tickers, is_ready, timeout):
+    """
+    Wait until is_ready(ticker) holds for every one of the tickers.
+    
+    One updateEvent handler tracks the tickers still missing, so a batch
+    costs a single wait however many tickers it has.
+    
+    Returns:
+        True if the condition was met for all, False on timeout
+    """
+    # Tickers compare by value, so track them by identity
+    pending = {id(tk) for tk in tickers if not is_ready(tk)}
+    if not pending:
+        return True
+    
+    ready = asyncio.get_running_loop().create_future()
+    
+    def on_update(tk, *args):
+        if id(tk) in pending and is_ready(tk):
+            pending.discard(id(tk))
+            if not pending and not ready.done():
+                ready.set_result(True)
+    
+    for tk in tickers:
+        tk.updateEvent += on_update
+    try:
+        return await asyncio.wait_for(ready, timeout)
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        for tk in tickers:
+            tk.updateEvent -= on_update
+
+
+async def _wait_for_quote_async(tickers, max_wait):
+    """
+    Give fresh subscriptions up to max_wait seconds to deliver a bid/ask.
+    
+    Returns as soon as any ticker has one; otherwise waits the full
+    max_wait so safe_mark() can fall back to last/close.
+    """
+    return await _wait_for_any_async(tickers, _has_quote, max_wait)
+
+
+async def wait_for_quote_async(tk: Ticker, timeout=1.5):
+    """Async version of wait_for_quote()."""
+    return await _wait_for_quote_async([tk], timeout)
+
+
+def wait_for_quote(tk: Ticker, timeout=1.5):
+    """
+    Wait for a ticker's bid/ask to populate.
+    
+    Returns as soon as a valid bid/ask pair arrives, so the timeout is an
+    upper bound rather than a fixed warmup.
+    
+    Args:
+        tk: Ticker object
+        timeout: Maximum time to wait in seconds
+    
+    Returns:
+        True if a bid/ask is available, False otherwise
+    """
+    if _has_quote(tk):
+        return True
+    return util.run(wait_for_quote_async(tk, timeout))
+
+
+def _record_greeks_latency(elapsed):
+    """Fold one observed Greek wait into the latency EMA."""
+    global _greeks_latency_ema
+    _greeks_latency_ema += _LATENCY_ALPHA * (elapsed - _greeks_latency_ema)
+
+
+async def wait_for_any_greeks_async(tickers, timeout=3.0):
+    """
+    Wait until any of several tickers has Greeks.
+    
+    The wait is cut short at _GREEKS_WAIT_FACTOR times the recently observed
+    arrival time. Timed-out waits count as observations too, so the limit
+    grows again when Greeks get slower.
+    
+    Args:
+        tickers: Ticker objects to watch
+        timeout: Maximum time to wait in seconds
+    
+    Returns:
+        True if Greeks arrived on at least one ticker, False otherwise
+    """
+    if any(_has_greeks(tk) for tk in tickers):
+        return True
+    
+    wait = min(timeout, max(_MIN_GREEKS_WAIT, _GREEKS_WAIT_FACTOR * _greeks_latency_ema))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    ready = await _wait_for_any_async(tickers, _has_greeks, wait)
+    _record_greeks_latency(loop.time() - start)
+    return ready
+
+
+async def wait_for_all_greeks_async(tickers, timeout=3.0):
+    """
+    Wait until every one of several tickers has Greeks.
+    
+    Used for batches: one wait covers all subscriptions and ends when the
+    last Greeks arrive. The limit adapts like wait_for_any_greeks_async(),
+    with the batch counting as one observation.
+    
+    Args:
+        tickers: Ticker objects to watch
+        timeout: Maximum time to wait in seconds
+    
+    Returns:
+        True if Greeks arrived on all tickers, False otherwise
+    """
+    if all(_has_greeks(tk) for tk in tickers):
+        return True
+    
+    wait = min(timeout, max(_MIN_GREEKS_WAIT, _GREEKS_WAIT_FACTOR * _greeks_latency_ema))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    ready = await _wait_for_all_async(tickers, _has_greeks, wait)
+    _record_greeks_latency(loop.time() - start)
+    return ready
+
+
+async def wait_for_greeks_async(tk: Ticker, timeout=3.0):
+    """Async version of wait_for_greeks()."""
+    return await wait_for_any_greeks_async([tk], timeout)
+
+
 def wait_for_greeks(tk: Ticker, timeout=3.0):
     """
-    Wait for option Greeks to populate with adaptive polling.
+    Wait for option Greeks to populate.
+    
+    Runs the IB event loop until the ticker reports Greeks or the timeout
+    expires, so updates keep flowing while waiting.
     
     Args:
         tk: Ticker object
@@ -53,24 +366,93 @@ def wait_for_greeks(tk: Ticker, timeout=3.0):
     Returns:
         True if Greeks are available, False otherwise
     """
-    start_time = time.time()
-    end = start_time + timeout
-    while time.time() < end:
-        if tk.modelGreeks and tk.modelGreeks.delta is not None:
-            return True
+    if _has_greeks(tk):
+        return True
+    return util.run(wait_for_greeks_async(tk, timeout))
+
+
+async def wait_for_quote_and_greeks_async(tk: Ticker, timeout=3.0):
+    """
+    Wait until a ticker has both a bid/ask and Greeks.
+    
+    The two arrive independently, so waiting on both together returns as
+    soon as the later one does instead of sitting out two waits in a row.
+    
+    Args:
+        tk: Ticker object
+        timeout: Maximum time to wait in seconds
+    
+    Returns:
+        True if both are available, False on timeout
+    """
+    return await _wait_for_any_async([tk], lambda t: _has_quote(t) and _has_greeks(t), timeout)
+
+
+def _quote_data(strike, expiry, tk, mark):
+    """Build the option data dict returned by the quote functions."""
+    greeks = tk.modelGreeks
+    return {
+        'strike': strike,
+        'expiry': expiry,
+        'bid': tk.bid,
+        'ask': tk.ask,
+        'mark': mark,
+        'delta': greeks.delta if greeks else None,
+        'gamma': greeks.gamma if greeks else None,
+        'theta': greeks.theta if greeks else None,
+        'iv': greeks.impliedVol if greeks else None,
+        'dte': dte(expiry)
+    }
+
+
+async def _fetch_option_quote_async(ib, symbol, expiry, strike, right, exchanges, timeout):
+    """
+    Quote an option on one or more exchanges at once.
+    
+    Qualifies and subscribes on every given exchange together, so the
+    round-trips overlap instead of being paid one exchange at a time.
+    
+    Returns:
+        (data dict, exchange) for the best quote, or None
+    """
+    subscribed = []
+    try:
+        legs = [(strike, ex) for ex in exchanges]
+        for opt in await qualify_options_async(ib, symbol, expiry, right, legs):
+            if opt.conId:
+                subscribed.append((opt, _subscribe(ib, opt, "106")))
+        if not subscribed:
+            return None
         
-        # Adaptive polling: start fast, then slow down
-        elapsed = time.time() - start_time
-        if elapsed < 0.5:
-            time.sleep(0.05)  # Fast polling first 500ms
-        elif elapsed < 1.5:
-            time.sleep(0.10)  # Medium polling next 1s
-        else:
-            time.sleep(0.20)  # Slower polling if taking long
-    return False
+        # Quotes and Greeks arrive independently; wait for both at once
+        tickers = [tk for _, tk in subscribed]
+        await asyncio.gather(_wait_for_quote_async(tickers, 0.4), wait_for_any_greeks_async(tickers, timeout))
+        
+        # Prefer a quote with Greeks, in the given exchange order
+        best = None
+        for opt, tk in subscribed:
+            mark = safe_mark(tk)
+            if mark is None:
+                continue
+            if tk.modelGreeks and tk.modelGreeks.delta is not None:
+                best = (opt, tk, mark)
+                break
+            if best is None:
+                best = (opt, tk, mark)
+        if best is None:
+            return None
+        
+        opt, tk, mark = best
+        return _quote_data(strike, expiry, tk, mark), opt.exchange
+    except Exception:
+        return None
+    finally:
+        # Always clean up market data subscriptions
+        for opt, _ in subscribed:
+            _unsubscribe(ib, opt)
 
 
-def get_option_quote(ib, symbol, expiry, strike, right='C', timeout=2.5, use_cache=True, cache_ttl=60):
+async def get_option_quote_async(ib, symbol, expiry, strike, right='C', timeout=2.5, use_cache=True, cache_ttl=60):
     """
     Get quote and Greeks for a specific option.
     Uses caching to reduce API calls.
@@ -88,64 +470,159 @@ def get_option_quote(ib, symbol, expiry, strike, right='C', timeout=2.5, use_cac
     Returns:
         Dictionary with option data or None
     """
-    from utils import dte
-    
     # Try cache first
     if use_cache:
-        cache = get_cache(ttl_seconds=cache_ttl)
-        cached_data = cache.get(symbol, expiry, strike, right)
+        cached_data = _CACHE.get(symbol, expiry, strike, right, ttl_seconds=cache_ttl)
+        if cached_data is MISS:
+            # Failed recently on every exchange; don't retry yet
+            return None
         if cached_data is not None:
             # Cache hit!
             return cached_data
     
-    # Cache miss - fetch from IB
-    for ex in FALLBACK_EXCHANGES:
-        opt = Option(symbol, expiry, strike, right, exchange=ex, currency='USD', tradingClass=symbol)
-        tk = None
+    # Cache miss - fetch from IB (once, even if other tasks miss too)
+    return await single_flight_async(
+        ('OPT', symbol, expiry, strike, right),
+        lambda: _fetch_and_cache_option_quote_async(ib, symbol, expiry, strike, right, timeout, use_cache))
+
+
+def get_option_quote(ib, symbol, expiry, strike, right='C', timeout=2.5, use_cache=True, cache_ttl=60):
+    """Blocking version of get_option_quote_async()."""
+    return util.run(get_option_quote_async(ib, symbol, expiry, strike, right, timeout, use_cache, cache_ttl))
+
+
+async def _fetch_and_cache_option_quote_async(ib, symbol, expiry, strike, right, timeout, use_cache):
+    """Fetch an option quote from IB and store it in the cache."""
+    # Start with the exchange that worked last time for this symbol so the
+    # steady state needs one subscription
+    last_good = _LAST_GOOD_EXCHANGE.get(symbol)
+    if last_good is not None:
+        result = await _fetch_option_quote_async(ib, symbol, expiry, strike, right, [last_good], timeout)
+        if result is None:
+            others = [ex for ex in FALLBACK_EXCHANGES if ex != last_good]
+            result = await _fetch_option_quote_async(ib, symbol, expiry, strike, right, others, timeout)
+    else:
+        result = await _fetch_option_quote_async(ib, symbol, expiry, strike, right, FALLBACK_EXCHANGES, timeout)
+    if result is None:
+        if use_cache:
+            _CACHE.put_negative(symbol, expiry, strike, right, _NEGATIVE_TTL)
+        return None
+    
+    data, exchange = result
+    _LAST_GOOD_EXCHANGE[symbol] = exchange
+    
+    # Store in cache
+    if use_cache:
+        _CACHE.put(symbol, expiry, strike, right, data)
+    
+    return data
+
+
+async def get_option_quotes_async(ib, symbol, expiry, strikes, right='C', timeout=2.5, use_cache=True, cache_ttl=60,
+                                  maybe_unlisted=()):
+    """
+    Get quotes and Greeks for several strikes of one expiry at once.
+    
+    All uncached strikes are qualified in one call and subscribed together,
+    then a single wait covers every subscription, so N strikes cost about
+    one quote's wall time instead of N. Strikes that qualify but don't
+    produce a quote on the batch exchange are retried on the other
+    exchanges, concurrently. A strike that doesn't qualify while others of
+    the batch do isn't listed for the expiry, so it isn't retried; if it is
+    in maybe_unlisted it is also skipped by later batches for a few minutes.
+    
+    Args:
+        ib: Connected IB instance
+        symbol: Underlying symbol
+        expiry: Expiration date (YYYYMMDD)
+        strikes: Strike prices to quote
+        right: 'C' for call or 'P' for put
+        timeout: Timeout for Greeks
+        use_cache: Whether to use cache (default: True)
+        cache_ttl: Cache TTL in seconds (default: 60)
+        maybe_unlisted: Strikes that may not be listed for this expiry (taken
+            from a chain definition rather than the expiry's own chain)
+    
+    Returns:
+        List of option data dictionaries, in strike order of the input
+        (strikes without a quote are left out)
+    """
+    results = {}
+    
+    # Serve what we can from cache (including strikes known to have no quote)
+    if use_cache:
+        for strike in strikes:
+            cached_data = _CACHE.get(symbol, expiry, strike, right, ttl_seconds=cache_ttl)
+            if cached_data is not None:
+                results[strike] = cached_data
+    unlisted = unlisted_strikes(symbol, expiry, right)
+    pending = [k for k in strikes if k not in results and k not in unlisted]
+    
+    if pending:
+        # Submit: qualify and subscribe every strike on one exchange
+        exchange = _LAST_GOOD_EXCHANGE.get(symbol, FALLBACK_EXCHANGES[0])
+        subscribed = []
+        failed = []
         try:
-            ib.qualifyContracts(opt)
-            tk = ib.reqMktData(opt, "106", False, False)
-            ib.sleep(0.4)
-            wait_for_greeks(tk, timeout=timeout)
-            
-            mark = safe_mark(tk)
-            greeks = tk.modelGreeks
+            legs = [(k, exchange) for k in pending]
+            for k, opt in zip(pending, await qualify_options_async(ib, symbol, expiry, right, legs)):
+                if opt.conId:
+                    subscribed.append((k, opt, _subscribe(ib, opt, "106")))
+                else:
+                    failed.append(k)
+            if not subscribed:
+                # Nothing qualified: the request failed rather than the strikes
+                failed = []
+            elif failed:
+                _record_unlisted(symbol, expiry, right, [k for k in failed if k in maybe_unlisted])
             
-            if mark is not None:
-                data = {
-                    'strike': strike,
-                    'expiry': expiry,
-                    'bid': tk.bid,
-                    'ask': tk.ask,
-                    'mark': mark,
-                    'delta': greeks.delta if greeks else None,
-                    'gamma': greeks.gamma if greeks else None,
-                    'theta': greeks.theta if greeks else None,
-                    'iv': greeks.impliedVol if greeks else None,
-                    'dte': dte(expiry)
-                }
-                
-                # Clean up market data subscription
-                ib.cancelMktData(opt)
+            if subscribed:
+                # Wait once for the whole batch, quotes and Greeks together
+                tickers = [tk for _, _, tk in subscribed]
+                await asyncio.gather(_wait_for_quote_async(tickers, 0.4), wait_for_all_greeks_async(tickers, timeout))
                 
-                # Store in cache
-                if use_cache:
-                    cache.put(symbol, expiry, strike, right, data)
-                
-                return data
+                # Collect
+                for k, opt, tk in subscribed:
+                    mark = safe_mark(tk)
+                    if mark is None:
+                        continue
+                    data = _quote_data(k, expiry, tk, mark)
+                    results[k] = data
+                    if use_cache:
+                        _CACHE.put(symbol, expiry, k, right, data)
         except Exception:
-            continue
+            pass
         finally:
-            # Always clean up market data subscription
-            if tk:
-                try:
-                    ib.cancelMktData(opt)
-                except Exception:
-                    pass
-    return None
+            for _, opt, _ in subscribed:
+                _unsubscribe(ib, opt)
+        
+        # Strikes that qualified but got no quote are retried on the other
+        # fallback exchanges
+        others = [ex for ex in FALLBACK_EXCHANGES if ex != exchange]
+        missed = [k for k in pending if k not in results and k not in failed]
+        if others and missed:
+            retried = await asyncio.gather(
+                *(_fetch_option_quote_async(ib, symbol, expiry, k, right, others, timeout) for k in missed))
+            for k, result in zip(missed, retried):
+                if result is not None:
+                    data, _ = result
+                    results[k] = data
+                    if use_cache:
+                        _CACHE.put(symbol, expiry, k, right, data)
+                elif use_cache:
+                    _CACHE.put_negative(symbol, expiry, k, right, _NEGATIVE_TTL)
+    
+    return [data for data in (results.get(k) for k in strikes) if data is not None and data is not MISS]
 
 
-def get_stock_price(ib, symbol, use_cache=True, cache_ttl=30):
+def get_option_quotes(ib, symbol, expiry, strikes, right='C', timeout=2.5, use_cache=True, cache_ttl=60,
+                      maybe_unlisted=()):
+    """Blocking version of get_option_quotes_async()."""
+    return util.run(get_option_quotes_async(ib, symbol, expiry, strikes, right, timeout, use_cache, cache_ttl,
+                                            maybe_unlisted))
+
+
+async def get_stock_price_async(ib, symbol, use_cache=True, cache_ttl=30):
     """
     Get current stock price with optional caching.
     
@@ -160,58 +637,204 @@ def get_stock_price(ib, symbol, use_cache=True, cache_ttl=30):
     """
     # Try cache first
     if use_cache:
-        cache = get_cache(ttl_seconds=cache_ttl)
-        cached = cache.get(symbol, 'STOCK', 0, 'STOCK')
+        cached = _CACHE.get(symbol, 'STOCK', 0, 'STOCK', ttl_seconds=cache_ttl)
+        if cached is MISS:
+            return None
         if cached:
             return cached.get('price')
     
-    # Cache miss - fetch from IB
-    # Try NASDAQ first
-    for exchange in ['NASDAQ', 'NYSE', 'SMART']:
-        stkt = None
+    # Cache miss - fetch from IB (once, even if other tasks miss too)
+    return await single_flight_async(('STK', symbol), lambda: _fetch_stock_price_async(ib, symbol, use_cache))
+
+
+def get_stock_price(ib, symbol, use_cache=True, cache_ttl=30):
+    """Blocking version of get_stock_price_async()."""
+    return util.run(get_stock_price_async(ib, symbol, use_cache, cache_ttl))
+
+
+async def get_stock_prices_async(ib, symbols, use_cache=True, cache_ttl=30):
+    """
+    Get current prices for several stocks at once.
+    
+    Uncached symbols are qualified together and priced from a single batch
+    of snapshot requests; any symbol that doesn't get a price that way goes
+    through get_stock_price_async()'s per-exchange fallback.
+    
+    Args:
+        ib: Connected IB instance
+        symbols: Stock symbols
+        use_cache: Whether to use cache (default: True)
+        cache_ttl: Cache TTL in seconds (default: 30)
+    
+    Returns:
+        Dictionary of symbol -> price (None where unavailable)
+    """
+    prices = {}
+    pending = []
+    for symbol in dict.fromkeys(symbols):
+        if use_cache:
+            cached = _CACHE.get(symbol, 'STOCK', 0, 'STOCK', ttl_seconds=cache_ttl)
+            if cached is MISS:
+                prices[symbol] = None
+                continue
+            if cached:
+                prices[symbol] = cached.get('price')
+                continue
+        pending.append(symbol)
+    
+    if pending:
         try:
-            stk = Stock(symbol, 'SMART', 'USD', primaryExchange=exchange)
-            ib.qualifyContracts(stk)
-            stkt = ib.reqMktData(stk, '', False, False)
-            ib.sleep(0.8)
-            price = safe_mark(stkt)
-            
-            # Clean up subscription
-            ib.cancelMktData(stk)
-            
+            stocks = await asyncio.gather(
+                *(qualify_stock_async(ib, symbol, _LAST_GOOD_PRIMARY.get(symbol)) for symbol in pending))
+            qualified = [(symbol, stk) for symbol, stk in zip(pending, stocks) if stk.conId]
+            tickers = await _snapshot_async(ib, [stk for _, stk in qualified], 0.8) if qualified else []
+        except Exception:
+            qualified, tickers = [], []
+        
+        for (symbol, _), tk in zip(qualified, tickers):
+            price = safe_mark(tk) if tk is not None else None
             if price is not None and price > 0:
-                # Cache the result
+                prices[symbol] = price
                 if use_cache:
-                    cache.put(symbol, 'STOCK', 0, 'STOCK', {'price': price})
-                return price
+                    _CACHE.put(symbol, 'STOCK', 0, 'STOCK', {'price': price})
+        
+        # Fall back per symbol (trying each primary exchange) for the rest
+        missed = [symbol for symbol in pending if symbol not in prices]
+        if missed:
+            fallback = await asyncio.gather(
+                *(get_stock_price_async(ib, symbol, use_cache, cache_ttl) for symbol in missed))
+            prices.update(zip(missed, fallback))
+    
+    return prices
+
+
+def get_stock_prices(ib, symbols, use_cache=True, cache_ttl=30):
+    """Blocking version of get_stock_prices_async()."""
+    return util.run(get_stock_prices_async(ib, symbols, use_cache, cache_ttl))
+
+
+async def _snapshot_async(ib, contracts, timeout):
+    """
+    Request one-shot snapshot tickers for several contracts in one go.
+    
+    Snapshots end on their own, so there is nothing to cancel. If they
+    haven't all completed within timeout, the tickers are returned with
+    whatever data has arrived so far.
+    
+    Returns:
+        List of Tickers (None where no ticker was created), in input order
+    """
+    try:
+        return await asyncio.wait_for(ib.reqTickersAsync(*contracts), timeout)
+    except asyncio.TimeoutError:
+        return [ib.ticker(c) for c in contracts]
+
+
+async def _stock_mark_async(ib, symbol, primary_exchange=None):
+    """Qualify a stock, take a snapshot and return its mark (or None)."""
+    stk = await qualify_stock_async(ib, symbol, primary_exchange)
+    if not stk.conId:
+        return None
+    stkt, = await _snapshot_async(ib, [stk], 0.8)
+    return safe_mark(stkt) if stkt is not None else None
+
+
+async def _fetch_stock_price_async(ib, symbol, use_cache):
+    """Fetch a stock price from IB and store it in the cache."""
+    # Try NASDAQ first, unless another primary exchange worked last time
+    exchanges = ['NASDAQ', 'NYSE', 'SMART']
+    last_good = _LAST_GOOD_PRIMARY.get(symbol)
+    if last_good is not None:
+        exchanges.remove(last_good)
+        exchanges.insert(0, last_good)
+    for exchange in exchanges:
+        try:
+            price = await _stock_mark_async(ib, symbol, exchange)
         except Exception:
-            if stkt:
-                try:
-                    ib.cancelMktData(stk)
-                except:
-                    pass
             continue
+        if price is not None and price > 0:
+            _LAST_GOOD_PRIMARY[symbol] = exchange
+            # Cache the result
+            if use_cache:
+                _CACHE.put(symbol, 'STOCK', 0, 'STOCK', {'price': price})
+            return price
     
     # Last resort - try without primaryExchange
-    stkt = None
     try:
-        stk = Stock(symbol, 'SMART', 'USD')
-        ib.qualifyContracts(stk)
-        stkt = ib.reqMktData(stk, '', False, False)
-        ib.sleep(0.8)
-        price = safe_mark(stkt)
-        
-        # Clean up subscription
-        ib.cancelMktData(stk)
-        
-        # Cache the result if we got one
-        if use_cache and price is not None:
-            cache.put(symbol, 'STOCK', 0, 'STOCK', {'price': price})
-        return price
+        price = await _stock_mark_async(ib, symbol)
     except Exception:
-        if stkt:
-            try:
-                ib.cancelMktData(stk)
-            except:
-                pass
-        return None
+        price = None
+    
+    # Cache the result (or the miss)
+    if use_cache:
+        if price is not None:
+            _CACHE.put(symbol, 'STOCK', 0, 'STOCK', {'price': price})
+        else:
+            _CACHE.put_negative(symbol, 'STOCK', 0, 'STOCK', _NEGATIVE_TTL)
+    return price
+
+
+async def wait_for_price_move_async(ib, symbols, threshold=0.005, timeout=240, references=None):
+    """
+    Wait until any of several stocks moves by more than threshold.
+    
+    Streams the stocks and resolves on their updateEvent, so a move is
+    noticed as soon as it is quoted. Moves are measured from the price the
+    last scan used, so a move that happened during the scan counts too.
+    The cached prices of the stocks that moved are dropped, so the rescan
+    (and the wait after it) starts from a fresh price.
+    
+    Args:
+        ib: Connected IB instance
+        symbols: Stock symbols to watch
+        threshold: Relative move that counts (default: 0.005 = 0.5%)
+        timeout: Maximum time to wait in seconds
+        references: Dict of symbol -> reference price. Defaults to the
+            cached stock prices (those the scan used); a symbol without one
+            is measured from its first mark after the wait starts.
+    
+    Returns:
+        True if a stock moved, False on timeout
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if references is None:
+        references = {}
+        for symbol in symbols:
+            # Any age: the cached price is the one the last scan worked with
+            cached = _CACHE.get(symbol, 'STOCK', 0, 'STOCK', ttl_seconds=float('inf'))
+            if cached:
+                references[symbol] = cached.get('price')
+    watched = [(s, c) for s, c in zip(symbols, await asyncio.gather(*(get_stock_contract_async(ib, s) for s in symbols)))
+               if c is not None]
+    contracts = [c for _, c in watched]
+    moved = asyncio.Event()
+    reference = {c.conId: references[s] for s, c in watched if references.get(s)}
+    symbol_of = {c.conId: s for s, c in watched}
+    
+    def on_update(tk, *args):
+        mark = safe_mark(tk)
+        if mark is None:
+            return
+        ref = reference.setdefault(tk.contract.conId, mark)
+        if abs(mark - ref) > threshold * ref:
+            _CACHE.discard(symbol_of[tk.contract.conId], 'STOCK', 0, 'STOCK')
+            moved.set()
+    
+    tickers = [_subscribe(ib, c) for c in contracts]
+    for tk in tickers:
+        tk.updateEvent += on_update
+    try:
+        await asyncio.wait_for(moved.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        for tk in tickers:
+            tk.updateEvent -= on_update
+        for c in contracts:
+            _unsubscribe(ib, c)
+
+
+def wait_for_price_move(ib, symbols, threshold=0.005, timeout=240, references=None):
+    """Blocking version of wait_for_price_move_async()."""
+    return util.run(wait_for_price_move_async(ib, symbols, threshold, timeout, references))
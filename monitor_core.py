@@ -0,0 +1,153 @@
+"""
+Setup and scanning shared by the roll monitor entry points.
+"""
+import argparse
+import asyncio
+import logging
+
+from ib_insync import util
+
+from market_data import get_stock_prices_async
+from portfolio import get_current_positions_async
+from utils import dte
+
+# Debug log written by both monitors
+LOG_FILE = '/tmp/roll_monitor_debug.log'
+
+
+def build_arg_parser(description, interval_help):
+    """
+    Build the command line parser with the options every monitor accepts.
+
+    Args:
+        description: Parser description
+        interval_help: Help text for --interval
+
+    Returns:
+        argparse.ArgumentParser (callers may add their own options)
+    """
+    ap = argparse.ArgumentParser(description=description)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=7496)
+    ap.add_argument("--clientId", type=int, default=2)
+    ap.add_argument("--target-delta-call", type=float, default=0.10, help="Target delta for covered calls")
+    ap.add_argument("--target-delta-put", type=float, default=-0.90, help="Target delta for cash-secured puts")
+    ap.add_argument("--delta-tolerance", type=float, default=0.03, help="Max delta deviation from target (default: 0.03, i.e., ±3 percentage points)")
+    ap.add_argument("--dte-threshold", type=int, default=45, help="Alert when DTE <= this (default: 45 for weekly rolling)")
+    ap.add_argument("--interval", type=int, default=240, help=interval_help)
+    ap.add_argument("--once", action="store_true", help="Run only once")
+    ap.add_argument("--skip-market-check", action="store_true", help="Skip market hours check")
+    ap.add_argument("--verbose", "-v", action="store_true", help="Verbose output for debugging")
+    ap.add_argument("--log-level", choices=['ERROR', 'WARNING', 'INFO', 'DEBUG'], default='INFO',
+                    help="Logging level (default: INFO)")
+    ap.add_argument("--realtime", action="store_true", default=False, help="Use real-time market data (requires subscription, default: delayed)")
+    return ap
+
+
+def setup_logging(log_level):
+    """
+    Send log records to LOG_FILE; call once at startup.
+
+    Args:
+        log_level: Level name ('ERROR', 'WARNING', 'INFO' or 'DEBUG')
+    """
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+        ]
+    )
+    # Suppress verbose ib_insync logging
+    logging.getLogger('ib_insync').setLevel(logging.WARNING)
+
+
+def build_config(args):
+    """
+    Build the monitor configuration dictionary from parsed arguments.
+
+    Args:
+        args: Namespace from build_arg_parser().parse_args()
+
+    Returns:
+        Configuration dictionary
+    """
+    config = {
+        'target_delta_call': args.target_delta_call,
+        'target_delta_put': args.target_delta_put,
+        'delta_tolerance': args.delta_tolerance,
+        'dte_threshold_for_alert': args.dte_threshold,
+        'check_interval_seconds': args.interval,
+        'verbose': args.verbose
+    }
+    if hasattr(args, 'max_rolls'):
+        config['max_rolls_per_position'] = args.max_rolls
+    return config
+
+
+def underlyings_to_scan(positions, config):
+    """Symbols of the positions within the roll alert DTE threshold."""
+    threshold = config['dte_threshold_for_alert']
+    return {pos['symbol'] for pos in positions if dte(pos['expiry']) <= threshold}
+
+
+def account_underlyings_to_scan(ib, config):
+    """
+    underlyings_to_scan() straight from ib.positions(), without market data.
+    
+    Args:
+        ib: Connected IB instance
+        config: Configuration dictionary
+    
+    Returns:
+        Set of symbols of short options within the roll alert DTE threshold
+    """
+    threshold = config['dte_threshold_for_alert']
+    return {pos.contract.symbol for pos in ib.positions()
+            if pos.contract.secType == 'OPT' and pos.position < 0
+            and dte(pos.contract.lastTradeDateOrContractMonth) <= threshold}
+
+
+async def prefetch_underlyings_async(ib, positions, config):
+    """
+    Price every underlying that will be analyzed in one batch.
+
+    The per-position stock price lookups of the roll search are then
+    cache hits instead of one request each.
+
+    Args:
+        ib: Connected IB instance
+        positions: Positions about to be analyzed
+        config: Configuration dictionary
+    """
+    symbols = underlyings_to_scan(positions, config)
+    if symbols:
+        await get_stock_prices_async(ib, symbols)
+
+
+async def fetch_positions_async(ib, config, retry_attempts=2):
+    """
+    Fetch the short option positions and price their underlyings together.
+    
+    Which underlyings will be scanned is already known from ib.positions()
+    before the positions' own market data arrives, so the stock price batch
+    runs alongside the position quotes instead of after them.
+    
+    Args:
+        ib: Connected IB instance
+        config: Configuration dictionary
+        retry_attempts: Number of retry attempts for position market data
+    
+    Returns:
+        List of position dictionaries (see portfolio.get_current_positions)
+    """
+    positions, _ = await asyncio.gather(
+        get_current_positions_async(ib, retry_attempts=retry_attempts,
+                                    dte_threshold=config['dte_threshold_for_alert']),
+        get_stock_prices_async(ib, account_underlyings_to_scan(ib, config)))
+    return positions
+
+
+def fetch_positions(ib, config, retry_attempts=2):
+    """Blocking version of fetch_positions_async()."""
+    return util.run(fetch_positions_async(ib, config, retry_attempts))
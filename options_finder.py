@@ -1,14 +1,53 @@
 """
 Options chain analysis and strike selection.
 """
-from ib_insync import Option
-from utils import dte, FALLBACK_EXCHANGES
-from market_data import get_option_quote, get_stock_price
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
-import threading
+from ib_insync import Option, util
+from utils import dte, parse_expiry, is_missing, FALLBACK_EXCHANGES
+from market_data import (get_option_quote_async, get_option_quotes_async,
+                         get_stock_price_async, get_stock_contract_async,
+                         single_flight_async, unlisted_strikes, clear_unlisted_strikes)
+from greeks_cache import clear_global_cache
+from greeks import estimate_deltas
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right
+import heapq
+from operator import itemgetter
 
+# Option chains by (symbol, right, exchange) -> (fetched_at, {expiry: sorted strikes}),
+# least recently used first. Chains change at most daily, and they are the
+# largest IB responses we request, so only the most recent ones are kept.
+_chain_cache = OrderedDict()
+_CHAIN_CACHE_SIZE = 64
 
-def _safe_req_contract_details(ib, contract, timeout=10):
+# How long an exchange that returned no chain is skipped for that symbol (seconds)
+_EMPTY_CHAIN_TTL = 300
+
+# Option chain definitions by symbol -> (UTC date fetched, (sorted expiries,
+# sorted strikes)). Listings only change overnight, so one request per
+# trading day is enough.
+_secdef_cache = {}
+
+# Overall limit for one find_strikes_by_delta() search, in seconds
+STRIKE_SEARCH_TIMEOUT = 180
+
+# Strikes quoted when an implied volatility lets us estimate deltas up front
+_SHORTLIST_SIZE = 6
+
+# Times the chain definition's strikes are re-sampled after some of the
+# sample turned out not to be listed for the expiry
+_SAMPLE_PASSES = 3
+
+# Exchange whose chain last produced a result, per symbol; tried first next time
+_chain_exchange = {}
+
+logger = logging.getLogger(__name__)
+
+
+async def _safe_req_contract_details_async(ib, contract, timeout=10):
     """
     Safely request contract details with timeout protection.
     
@@ -20,41 +59,192 @@ def _safe_req_contract_details(ib, contract, timeout=10):
     Returns:
         List of contract details or None on timeout/error
     """
-    import logging
+    logger.info("[_safe_req_contract_details] Requesting details for %s %s with %ss timeout", contract.symbol, contract.right, timeout)
+    try:
+        result = await asyncio.wait_for(ib.reqContractDetailsAsync(contract), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("[_safe_req_contract_details] TIMEOUT after %ss", timeout)
+        return None
+    except Exception as e:
+        logger.error("[_safe_req_contract_details] Exception: %s", e)
+        return None
     
-    logger = logging.getLogger(__name__)
-    logger.info(f"[_safe_req_contract_details] Requesting details for {contract.symbol} {contract.right} with {timeout}s timeout")
+    logger.info("[_safe_req_contract_details] Returning %s results", len(result) if result else 0)
+    return result
+
+
+async def _get_chain_async(ib, symbol, right, exchange, ttl=3600):
+    """
+    Get the strikes of every option expiry of a symbol on one exchange.
     
-    result = [None]
-    exception = [None]
+    The contract details are indexed once per download, so lookups don't
+    re-filter and re-sort the whole chain. Results are cached for ttl seconds;
+    an empty result (exchange doesn't list the symbol, or the request failed)
+    for _EMPTY_CHAIN_TTL, so the exchange loops skip it without a round-trip.
+    The timestamp is only set when the chain is downloaded, so hits never
+    write to the cache.
     
-    def _fetch():
-        try:
-            logger.info(f"[_safe_req_contract_details] Thread started, calling ib.reqContractDetails...")
-            result[0] = ib.reqContractDetails(contract)
-            logger.info(f"[_safe_req_contract_details] Got {len(result[0]) if result[0] else 0} results")
-        except Exception as e:
-            logger.error(f"[_safe_req_contract_details] Exception in thread: {e}")
-            exception[0] = e
+    Args:
+        ib: Connected IB instance
+        symbol: Underlying symbol
+        right: 'C' for call or 'P' for put
+        exchange: Exchange to query
+        ttl: Cache lifetime in seconds (default: 1 hour)
     
-    thread = threading.Thread(target=_fetch, daemon=True)
-    thread.start()
-    thread.join(timeout=timeout)
+    Returns:
+        Dict of expiry (YYYYMMDD) -> sorted list of strikes (may be empty)
+    """
+    key = (symbol, right, exchange)
+    cached = _chain_cache.get(key)
+    if cached is not None and time.time() - cached[0] < (ttl if cached[1] else min(ttl, _EMPTY_CHAIN_TTL)):
+        _chain_cache.move_to_end(key)
+        return cached[1]
+    
+    # Positions on the same underlying miss together; they share one download
+    chain = await single_flight_async(('CHAIN',) + key, lambda: _download_chain_async(ib, symbol, right, exchange))
+    _chain_cache[key] = (time.time(), chain)
+    _chain_cache.move_to_end(key)
+    if len(_chain_cache) > _CHAIN_CACHE_SIZE:
+        _chain_cache.popitem(last=False)
+    return chain
+
+
+async def _download_chain_async(ib, symbol, right, exchange):
+    """Request contract details for every option of a symbol on one exchange, indexed by expiry."""
+    probe = Option(symbol, '', 0.0, right, exchange=exchange, currency='USD', tradingClass=symbol)
+    # Whole chains of heavily listed underlyings take a while to arrive
+    cds = await _safe_req_contract_details_async(ib, probe, timeout=30)
+    by_expiry = {}
+    for cd in cds or ():
+        c = cd.contract
+        if c.right == right:
+            by_expiry.setdefault(c.lastTradeDateOrContractMonth, set()).add(c.strike)
+    return {expiry: sorted(strikes) for expiry, strikes in by_expiry.items()}
+
+
+def clear_option_caches():
+    """
+    Forget cached option chains, exchange hints and quotes.
+    
+    For tests, and for invalidating everything at the end of a trading day.
+    """
+    _chain_cache.clear()
+    _secdef_cache.clear()
+    _chain_exchange.clear()
+    clear_unlisted_strikes()
+    clear_global_cache()
+
+
+def _cached_expiry_strikes(symbol, right, expiry, ttl=3600):
+    """Strikes of one expiry from an already downloaded chain, or None."""
+    for ex in _chain_exchanges(symbol):
+        cached = _chain_cache.get((symbol, right, ex))
+        if cached is not None and time.time() - cached[0] < ttl and cached[1].get(expiry):
+            return cached[1][expiry]
+    return None
+
+
+def _chain_exchanges(symbol):
+    """FALLBACK_EXCHANGES, starting with the one that worked last for symbol."""
+    hint = _chain_exchange.get(symbol)
+    if hint is None:
+        return FALLBACK_EXCHANGES
+    return [hint] + [ex for ex in FALLBACK_EXCHANGES if ex != hint]
+
+
+def _strikes_between(strikes, lower, upper):
+    """Slice of sorted strikes within [lower, upper], found by binary search."""
+    return strikes[bisect_left(strikes, lower):bisect_right(strikes, upper)]
+
+
+async def _get_secdef_async(ib, symbol):
+    """
+    Fetch a symbol's option expirations and strikes in one lightweight request.
+    
+    reqSecDefOptParams returns the chain's expirations and strikes as a
+    handful of small messages, instead of contract details for every
+    strike/expiry combination. Results are kept until the date changes.
+    The strikes are those listed for any expiry, so a given expiry may not
+    trade all of them.
     
-    if thread.is_alive():
-        # Timeout occurred
-        logger.warning(f"[_safe_req_contract_details] TIMEOUT after {timeout}s")
+    Args:
+        ib: Connected IB instance
+        symbol: Underlying symbol
+    
+    Returns:
+        (sorted expiries (YYYYMMDD), sorted strikes), or None if unavailable
+    """
+    today = datetime.now(timezone.utc).date()
+    cached = _secdef_cache.get(symbol)
+    if cached is not None and cached[0] == today:
+        return cached[1]
+    
+    stock = await get_stock_contract_async(ib, symbol)
+    if stock is None:
+        return None
+    try:
+        params = await single_flight_async(
+            ('SECDEF', symbol), lambda: ib.reqSecDefOptParamsAsync(symbol, '', 'STK', stock.conId))
+    except Exception as e:
+        logger.error("[_get_secdef] Exception: %s", e)
         return None
     
-    if exception[0]:
-        logger.error(f"[_safe_req_contract_details] Returning None due to exception")
+    expirations = set()
+    strikes = set()
+    for p in params or ():
+        if p.tradingClass == symbol:
+            expirations.update(p.expirations)
+            strikes.update(p.strikes)
+    if not expirations:
+        return None
+    secdef = (sorted(expirations), sorted(strikes))
+    _secdef_cache[symbol] = (today, secdef)
+    return secdef
+
+
+def _select_roll_expiry(symbol, expiries, target_date):
+    """
+    Pick the roll expiry from a sorted list of expiries.
+    
+    Args:
+        symbol: Underlying symbol (for logging)
+        expiries: Sorted expiries (YYYYMMDD)
+        target_date: Current expiry + 7 days (date)
+    
+    Returns:
+        Selected expiry (YYYYMMDD) or None
+    """
+    logger.info("[get_next_weekly_expiry] Found %s expiries for %s", len(expiries), symbol)
+    logger.info("[get_next_weekly_expiry] Target date: %s", target_date.strftime('%Y%m%d'))
+    
+    # Log first few expiries with their DTEs
+    if logger.isEnabledFor(logging.DEBUG):
+        for exp in expiries[:5]:
+            logger.debug("  Expiry: %s, DTE: %s", exp, dte(exp))
+    
+    # Find expiries that are:
+    # 1. Within 30-60 DTE from today (widened range to accommodate rolls)
+    # 2. At least 7 days out from current expiry
+    # YYYYMMDD strings sort like dates, so both bounds are binary searches
+    today = datetime.now(timezone.utc).date()
+    lower = max(target_date, today + timedelta(days=30)).strftime('%Y%m%d')
+    upper = (today + timedelta(days=60)).strftime('%Y%m%d')
+    first = bisect_left(expiries, lower)
+    count = bisect_right(expiries, upper) - first
+    
+    logger.info("[get_next_weekly_expiry] Found %s candidates in 30-60 DTE range after target date", max(count, 0))
+    
+    if count <= 0:
         return None
     
-    logger.info(f"[_safe_req_contract_details] Returning {len(result[0]) if result[0] else 0} results")
-    return result[0]
+    # Pick the one closest to 1 week out from current expiry: every candidate
+    # is on or after the target date, so that is the earliest one
+    result = expiries[first]
+    logger.info("[get_next_weekly_expiry] Selected: %s", result)
+    return result
 
 
-def get_next_weekly_expiry(ib, symbol, current_expiry_date, right='C', timeout=30):
+async def get_next_weekly_expiry_async(ib, symbol, current_expiry_date, right='C', timeout=30):
     """
     Find expiry approximately 1 week out from current position expiry date,
     constrained to 30-60 DTE (days to expiration from today).
@@ -69,98 +259,49 @@ def get_next_weekly_expiry(ib, symbol, current_expiry_date, right='C', timeout=3
     Returns:
         Next expiry date (YYYYMMDD) or None
     """
-    from datetime import datetime, timedelta
-    import time
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
+    try:
+        return await asyncio.wait_for(_next_weekly_expiry_async(ib, symbol, current_expiry_date, right), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("[get_next_weekly_expiry] Timed out after %ss", timeout)
+        return None
+
+
+async def _next_weekly_expiry_async(ib, symbol, current_expiry_date, right):
+    """get_next_weekly_expiry_async() without the time limit."""
     # Parse current expiry and add 7 days to get target roll date
-    current_date = datetime.strptime(current_expiry_date, "%Y%m%d")
+    current_date = parse_expiry(current_expiry_date)
     target_date = current_date + timedelta(days=7)
     
-    start_time = time.time()
-    for ex in FALLBACK_EXCHANGES:
-        # Check timeout
-        if time.time() - start_time > timeout:
-            return None
-            
-        probe = Option(symbol, '', 0.0, right, exchange=ex, currency='USD', tradingClass=symbol)
+    # Fast path: expirations from the option chain definition
+    secdef = await _get_secdef_async(ib, symbol)
+    if secdef:
+        result = _select_roll_expiry(symbol, secdef[0], target_date)
+        if result:
+            return result
+    
+    # Fall back to probing contract details per exchange
+    for ex in _chain_exchanges(symbol):
         try:
-            cds = ib.reqContractDetails(probe)
-            if cds:
-                expiries = sorted({cd.contract.lastTradeDateOrContractMonth for cd in cds})
-                logger.info(f"[get_next_weekly_expiry] Found {len(expiries)} expiries for {symbol}")
-                logger.info(f"[get_next_weekly_expiry] Target date: {target_date.strftime('%Y%m%d')}")
-                
-                # Log first few expiries with their DTEs
-                for exp in expiries[:5]:
-                    logger.info(f"  Expiry: {exp}, DTE: {dte(exp)}")
-                
-                # Find expiries that are:
-                # 1. Within 30-60 DTE from today (widened range to accommodate rolls)
-                # 2. At least 7 days out from current expiry
-                candidates = [e for e in expiries 
-                             if 30 <= dte(e) <= 60
-                             and datetime.strptime(e, "%Y%m%d") >= target_date]
-                
-                logger.info(f"[get_next_weekly_expiry] Found {len(candidates)} candidates in 30-60 DTE range after target date")
-                
-                if candidates:
-                    # Pick the one closest to 1 week out from current expiry
-                    result = min(candidates, key=lambda e: abs(
-                        (datetime.strptime(e, "%Y%m%d") - target_date).days
-                    ))
-                    logger.info(f"[get_next_weekly_expiry] Selected: {result}")
+            chain = await _get_chain_async(ib, symbol, right, ex)
+            if chain:
+                expiries = sorted(chain)
+                result = _select_roll_expiry(symbol, expiries, target_date)
+                if result:
+                    _chain_exchange[symbol] = ex
                     return result
         except Exception as e:
-            logger.error(f"[get_next_weekly_expiry] Exception: {e}")
+            logger.error("[get_next_weekly_expiry] Exception: %s", e)
             continue
     return None
 
 
-def get_strike_data_parallel(ib, symbol, expiry, strikes, right='C', max_workers=5, timeout=60):
-    """
-    Fetch quotes for multiple strikes in parallel.
-    
-    WARNING: ib_insync is NOT thread-safe. This function should only be used
-    if you understand the risks. Default is now disabled (use_parallel=False).
-    
-    Args:
-        ib: Connected IB instance
-        symbol: Underlying symbol
-        expiry: Expiration date
-        strikes: List of strike prices
-        right: 'C' for call or 'P' for put
-        max_workers: Maximum parallel workers (default: 5)
-        timeout: Maximum time to wait for all results in seconds (default: 60)
-    
-    Returns:
-        List of option data dictionaries
-    """
-    results = []
-    
-    def fetch_quote(strike):
-        return get_option_quote(ib, symbol, expiry, strike, right=right)
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_strike = {
-            executor.submit(fetch_quote, k): k for k in strikes
-        }
-        
-        for future in as_completed(future_to_strike, timeout=timeout):
-            try:
-                opt_data = future.result(timeout=5)  # 5s timeout per result
-                if opt_data and opt_data['delta'] is not None:
-                    results.append(opt_data)
-            except Exception:
-                # Skip failed requests or timeouts
-                continue
-    
-    return results
+def get_next_weekly_expiry(ib, symbol, current_expiry_date, right='C', timeout=30):
+    """Blocking version of get_next_weekly_expiry_async()."""
+    return util.run(get_next_weekly_expiry_async(ib, symbol, current_expiry_date, right, timeout))
 
 
-def find_strikes_by_delta(ib, symbol, expiry, target_delta, spot, current_strike, right='C', use_parallel=False, delta_tolerance=0.03):
+async def find_strikes_by_delta_async(ib, symbol, expiry, target_delta, spot, current_strike, right='C', delta_tolerance=0.03, also_quote=(),
+                                      iv=None):
     """
     Find strikes near target delta for the given expiry.
     Optimized for specific delta targets with smart band selection and early exit.
@@ -176,168 +317,275 @@ def find_strikes_by_delta(ib, symbol, expiry, target_delta, spot, current_strike
         current_strike: Current position's strike
         right: 'C' for call or 'P' for put
         delta_tolerance: Maximum deviation from target delta (default 0.03)
+        also_quote: Extra strikes to quote in the same batch as the sample.
+            They only warm the quote cache for a follow-up get_option_quote()
+            and are not considered for the delta match.
+        iv: Implied volatility hint (e.g. the current position's). When given,
+            Black-Scholes deltas pick a short list of strikes to quote first.
     
     Returns:
         List of option data dictionaries
     """
-    import time
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    logger.info(f"[find_strikes_by_delta] Starting: symbol={symbol}, expiry={expiry}, target_delta={target_delta}, spot={spot}")
-    
-    start_time_total = time.time()
-    max_total_time = 180  # Maximum 3 minutes for entire function
+    logger.info("[find_strikes_by_delta] Starting: symbol=%s, expiry=%s, target_delta=%s, spot=%s", symbol, expiry, target_delta, spot)
+    
+    try:
+        return await asyncio.wait_for(
+            _find_strikes_by_delta_async(ib, symbol, expiry, target_delta, spot, current_strike, right,
+                                         delta_tolerance, also_quote, iv),
+            STRIKE_SEARCH_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("[find_strikes_by_delta] Overall timeout exceeded (%ss)", STRIKE_SEARCH_TIMEOUT)
+        return []
+
+
+async def _find_strikes_by_delta_async(ib, symbol, expiry, target_delta, spot, current_strike, right,
+                                       delta_tolerance, also_quote, iv):
+    """find_strikes_by_delta_async() without the overall time limit."""
+    # Fast path, without a chain download: this expiry's exact strikes if its
+    # chain is already cached, otherwise the chain definition's strikes
+    strikes = _cached_expiry_strikes(symbol, right, expiry)
+    if strikes:
+        options = await _match_delta_async(ib, symbol, expiry, strikes, target_delta, spot, current_strike,
+                                           right, delta_tolerance, also_quote, iv)
+        if options:
+            return options
+    else:
+        secdef = await _get_secdef_async(ib, symbol)
+        if secdef and expiry in secdef[0] and secdef[1]:
+            # The definition lists strikes of every expiry. Those that fail to
+            # qualify aren't listed for this one; sample again without them so
+            # they don't use up the sample (quoted strikes are cache hits)
+            for _ in range(_SAMPLE_PASSES):
+                skip = unlisted_strikes(symbol, expiry, right)
+                listed = [k for k in secdef[1] if k not in skip]
+                options = await _match_delta_async(ib, symbol, expiry, listed, target_delta, spot, current_strike,
+                                                   right, delta_tolerance, also_quote, iv, from_definition=True)
+                if options:
+                    return options
+                if unlisted_strikes(symbol, expiry, right) == skip:
+                    break
     
-    for ex in FALLBACK_EXCHANGES:
-        # Overall timeout check
-        if time.time() - start_time_total > max_total_time:
-            logger.warning(f"[find_strikes_by_delta] Overall timeout exceeded ({max_total_time}s)")
-            return []
-            
-        logger.info(f"[find_strikes_by_delta] Trying exchange: {ex}")
-        probe = Option(symbol, '', 0.0, right, exchange=ex, currency='USD', tradingClass=symbol)
+    # Fall back to the strikes each exchange lists for this very expiry
+    for ex in _chain_exchanges(symbol):
+        logger.info("[find_strikes_by_delta] Trying exchange: %s", ex)
         try:
-            logger.info(f"[find_strikes_by_delta] Requesting contract details...")
-            cds = ib.reqContractDetails(probe)
-            logger.info(f"[find_strikes_by_delta] Got {len(cds) if cds else 0} contract details")
+            logger.info("[find_strikes_by_delta] Requesting contract details...")
+            chain = await _get_chain_async(ib, symbol, right, ex)
+            logger.info("[find_strikes_by_delta] Got %s expiries", len(chain) if chain else 0)
         except Exception as e:
-            logger.error(f"[find_strikes_by_delta] Exception getting contract details: {e}")
+            logger.error("[find_strikes_by_delta] Exception getting contract details: %s", e)
             continue
             
-        if not cds:
+        if not chain:
             continue
             
         # Get strikes for this expiry
-        contracts_exp = [cd.contract for cd in cds
-                        if cd.contract.right == right and cd.contract.lastTradeDateOrContractMonth == expiry]
-        strikes = sorted({c.strike for c in contracts_exp})
-        
-        # Safety check: if there are too many strikes, something is wrong
-        if len(strikes) > 200:
-            # Likely a data issue or extremely wide range
-            # Reduce to reasonable subset around current strike
-            if current_strike:
-                # Keep strikes within ±30% of current strike
-                strikes = [k for k in strikes if current_strike * 0.7 <= k <= current_strike * 1.3]
-        
-        if not strikes:
-            continue
-        
-        # Smart band selection optimized for target delta
-        if spot:
-            if right == 'C':
-                # Call options
-                if target_delta < 0.15:
-                    # For low delta (0.10): adaptive band based on current position
-                    # Start from 3% above spot (where fresh positions would be)
-                    lower_bound = spot * 1.03  # 3% above spot
-                    
-                    # If current strike is deep OTM, expand upper bound to cover it
-                    # This handles cases where stock has moved significantly
-                    if current_strike and current_strike > spot * 1.10:
-                        # Deep OTM: extend search to 110% of current strike
-                        upper_bound = current_strike * 1.10
-                        logger.info(f"[find_strikes_by_delta] Deep OTM position detected: current=${current_strike:.2f}, spot=${spot:.2f}")
-                        logger.info(f"[find_strikes_by_delta] Expanding band to ${lower_bound:.2f}-${upper_bound:.2f}")
-                    else:
-                        # Normal case: 10% above spot
-                        upper_bound = spot * 1.10
-                    
-                    band = [k for k in strikes if lower_bound <= k <= upper_bound]
+        strikes = chain.get(expiry, [])
+        options = await _match_delta_async(ib, symbol, expiry, strikes, target_delta, spot, current_strike,
+                                           right, delta_tolerance, also_quote, iv)
+        if options:
+            _chain_exchange[symbol] = ex
+            return options
+    
+    return []
+
+
+async def _match_delta_async(ib, symbol, expiry, strikes, target_delta, spot, current_strike, right,
+                             delta_tolerance, also_quote, iv, from_definition=False):
+    """
+    Quote a sample of strikes and keep those closest to the target delta.
+    
+    Args:
+        strikes: Sorted candidate strikes for the expiry
+        from_definition: True if strikes come from the chain definition (so
+            some may not be listed for this expiry)
+        (others as for find_strikes_by_delta_async())
+    
+    Returns:
+        Up to 12 option data dictionaries within delta_tolerance, closest first
+        (empty if none)
+    """
+    # Safety check: if there are too many strikes, something is wrong
+    if len(strikes) > 200:
+        # Likely a data issue or extremely wide range
+        # Reduce to reasonable subset around current strike
+        if current_strike:
+            # Keep strikes within ±30% of current strike
+            strikes = _strikes_between(strikes, current_strike * 0.7, current_strike * 1.3)
+    
+    if not strikes:
+        return []
+    
+    # Smart band selection optimized for target delta
+    if spot:
+        if right == 'C':
+            # Call options
+            if target_delta < 0.15:
+                # For low delta (0.10): adaptive band based on current position
+                # Start from 3% above spot (where fresh positions would be)
+                lower_bound = spot * 1.03  # 3% above spot
+                
+                # If current strike is deep OTM, expand upper bound to cover it
+                # This handles cases where stock has moved significantly
+                if current_strike and current_strike > spot * 1.10:
+                    # Deep OTM: extend search to 110% of current strike
+                    upper_bound = current_strike * 1.10
+                    logger.info("[find_strikes_by_delta] Deep OTM position detected: current=$%.2f, spot=$%.2f", current_strike, spot)
+                    logger.info("[find_strikes_by_delta] Expanding band to $%.2f-$%.2f", lower_bound, upper_bound)
                 else:
-                    # For higher delta: closer to spot
-                    band = [k for k in strikes if (spot - 50) <= k <= (spot + 150)]
+                    # Normal case: 10% above spot
+                    upper_bound = spot * 1.10
+                
+                band = _strikes_between(strikes, lower_bound, upper_bound)
             else:
-                # Put options
-                if target_delta < -0.85:
-                    # For low delta puts (-0.90): adaptive band based on current position
-                    # Start from 3% below spot (where fresh positions would be)
-                    upper_bound = spot * 0.97  # 3% below spot
-                    
-                    # If current strike is deep OTM, expand lower bound to cover it
-                    if current_strike and current_strike < spot * 0.90:
-                        # Deep OTM: extend search to 90% of current strike
-                        lower_bound = current_strike * 0.90
-                        logger.info(f"[find_strikes_by_delta] Deep OTM position detected: current=${current_strike:.2f}, spot=${spot:.2f}")
-                        logger.info(f"[find_strikes_by_delta] Expanding band to ${lower_bound:.2f}-${upper_bound:.2f}")
-                    else:
-                        # Normal case: 10% below spot
-                        lower_bound = spot * 0.90
-                    
-                    band = [k for k in strikes if lower_bound <= k <= upper_bound]
+                # For higher delta: closer to spot
+                band = _strikes_between(strikes, spot - 50, spot + 150)
+        else:
+            # Put options
+            if target_delta < -0.85:
+                # For low delta puts (-0.90): adaptive band based on current position
+                # Start from 3% below spot (where fresh positions would be)
+                upper_bound = spot * 0.97  # 3% below spot
+                
+                # If current strike is deep OTM, expand lower bound to cover it
+                if current_strike and current_strike < spot * 0.90:
+                    # Deep OTM: extend search to 90% of current strike
+                    lower_bound = current_strike * 0.90
+                    logger.info("[find_strikes_by_delta] Deep OTM position detected: current=$%.2f, spot=$%.2f", current_strike, spot)
+                    logger.info("[find_strikes_by_delta] Expanding band to $%.2f-$%.2f", lower_bound, upper_bound)
                 else:
-                    # For higher delta puts: closer to spot
-                    band = [k for k in strikes if (spot - 150) <= k <= (spot + 50)]
-            
-            # For small bands, use ALL strikes (no sampling)
-            # For larger bands, use optimized sampling to reduce API calls
-            if len(band) <= 10:
-                # Band is small enough - check all strikes
-                sample = band
+                    # Normal case: 10% below spot
+                    lower_bound = spot * 0.90
+                
+                band = _strikes_between(strikes, lower_bound, upper_bound)
             else:
-                # Band is large - evenly sample max 10 strikes (reduced for volatile stocks)
-                # This balances thoroughness with performance
-                step = len(band) / 10
-                sample = [band[int(i * step)] for i in range(10)]
-        else:
-            # Fallback if no spot price (should be rare during market hours)
-            sample = strikes[:20]
+                # For higher delta puts: closer to spot
+                band = _strikes_between(strikes, spot - 150, spot + 50)
         
-        # Get quotes - use parallel or sequential fetching
-        if use_parallel:
-            # Parallel fetching for better performance
-            options = get_strike_data_parallel(ib, symbol, expiry, sample, right=right, max_workers=5)
+        # For small bands, use ALL strikes (no sampling)
+        # For larger bands, use optimized sampling to reduce API calls
+        if len(band) <= 10:
+            # Band is small enough - check all strikes
+            sample = band
         else:
-            # Sequential fetching with early exit
-            options = []
-            good_options_count = 0
-            target_good_options = 8  # Early exit after finding 8 near target
-            
-            import time
-            max_duration = 60  # Maximum 1 minute for all strikes (reduced for MSTR)
-            start_time = time.time()
-            
-            for k in sample:
-                # Safety timeout to prevent infinite hangs
-                if time.time() - start_time > max_duration:
-                    break
-                    
-                opt_data = get_option_quote(ib, symbol, expiry, k, right=right)
-                if opt_data and opt_data['delta'] is not None:
-                    options.append(opt_data)
-                    
-                    # Early exit if we found enough good options near target delta
-                    if abs(abs(opt_data['delta']) - abs(target_delta)) <= delta_tolerance:
-                        good_options_count += 1
-                        if good_options_count >= target_good_options:
-                            break
-        
-        if not options:
-            continue
-        
-        # Apply configurable delta filter before sorting
-        # Use tolerance from config (default 0.03 = ±3 percentage points)
-        min_delta = abs(target_delta) - delta_tolerance
-        max_delta = abs(target_delta) + delta_tolerance
-        
-        # Filter options to only those within acceptable delta range
-        filtered_options = [o for o in options if min_delta <= abs(o['delta']) <= max_delta]
+            # Band is large - evenly sample max 10 strikes (reduced for volatile stocks)
+            # This balances thoroughness with performance
+            step = len(band) / 10
+            sample = [band[int(i * step)] for i in range(10)]
         
-        if not filtered_options:
-            logger.warning(f"[find_strikes_by_delta] No options within delta range {min_delta:.2f}-{max_delta:.2f} (target={target_delta:.2f}, tolerance=±{delta_tolerance:.2f})")
-            continue
-        
-        # Sort by delta closeness to target (using absolute values for comparison)
-        filtered_options.sort(key=lambda o: abs(abs(o['delta']) - abs(target_delta)))
-        
-        # Return top 12 closest to target delta
-        return filtered_options[:12]
+        # With a volatility estimate, first quote only the strikes whose
+        # estimated delta is closest to the target; the even sample is the
+        # fallback if none of them turns out within tolerance
+        if len(band) > _SHORTLIST_SIZE and not is_missing(iv) and iv > 0:
+            estimates = estimate_deltas(spot, band, max(dte(expiry), 1) / 365, iv, right)
+            shortlist = sorted(k for _, k in heapq.nsmallest(
+                _SHORTLIST_SIZE, zip((abs(d - target_delta) for d in estimates), band), key=itemgetter(0)))
+            options = await _quote_and_rank_async(ib, symbol, expiry, shortlist, target_delta, right,
+                                                  delta_tolerance, also_quote, from_definition)
+            if options:
+                return options
+    else:
+        # Fallback if no spot price (should be rare during market hours)
+        sample = strikes[:20]
     
-    return []
+    return await _quote_and_rank_async(ib, symbol, expiry, sample, target_delta, right, delta_tolerance, also_quote,
+                                       from_definition)
 
 
-def find_roll_options(ib, position, config):
+async def _quote_and_rank_async(ib, symbol, expiry, sample, target_delta, right, delta_tolerance, also_quote,
+                                from_definition=False):
+    """
+    Quote sample strikes and rank those within delta_tolerance of the target.
+    
+    Returns:
+        Up to 12 option data dictionaries, closest to the target delta first
+        (empty if none)
+    """
+    # Get quotes in one batch (extra strikes ride along): every strike is
+    # subscribed at once and waited on together, instead of one after another
+    sampled = set(sample)
+    to_quote = list(sample) + [k for k in also_quote if k not in sampled]
+    quotes = await get_option_quotes_async(ib, symbol, expiry, to_quote, right=right,
+                                           maybe_unlisted=sample if from_definition else ())
+    options = [o for o in quotes if o and o['delta'] is not None and o['strike'] in sampled]
+    
+    if not options:
+        return []
+    
+    # Apply configurable delta filter before sorting
+    # Use tolerance from config (default 0.03 = ±3 percentage points).
+    # Each option's distance from the target (using absolute values) is
+    # computed once and reused as the ranking key.
+    abs_target = abs(target_delta)
+    filtered_options = []
+    for o in options:
+        dist = abs(abs(o['delta']) - abs_target)
+        if dist <= delta_tolerance:
+            filtered_options.append((dist, o))
+    
+    if not filtered_options:
+        logger.warning("[find_strikes_by_delta] No options within delta range %.2f-%.2f (target=%.2f, tolerance=±%.2f)",
+                       abs_target - delta_tolerance, abs_target + delta_tolerance, target_delta, delta_tolerance)
+        return []
+    
+    # Return top 12 closest to target delta; partial selection instead of
+    # sorting the whole list
+    return [o for _, o in heapq.nsmallest(12, filtered_options, key=itemgetter(0))]
+
+
+def find_strikes_by_delta(ib, symbol, expiry, target_delta, spot, current_strike, right='C', delta_tolerance=0.03, also_quote=(),
+                          iv=None):
+    """Blocking version of find_strikes_by_delta_async()."""
+    return util.run(find_strikes_by_delta_async(ib, symbol, expiry, target_delta, spot, current_strike,
+                                                right, delta_tolerance, also_quote, iv))
+
+
+def _roll_option(opt_type, opt, buyback_cost, current_delta, roi_scale):
+    """
+    Build a roll candidate with its metrics.
+    
+    Args:
+        opt_type: Roll label (e.g. 'Same Strike')
+        opt: Option data dictionary of the new option
+        buyback_cost: Cost to close the current option
+        current_delta: Current position's delta (or None)
+        roi_scale: 100 / current strike (0 if the strike is not positive)
+    
+    Returns:
+        Roll option dictionary, or None if the roll isn't for a net credit
+    """
+    mark = opt['mark']
+    net_credit = mark - buyback_cost
+    # Only profitable rolls are offered
+    if net_credit <= 0:
+        return None
+    
+    # Net delta change: new_delta - current_delta
+    delta = opt['delta']
+    net_delta = delta - current_delta if current_delta is not None and delta is not None else None
+    
+    # Premium Efficiency: (net_credit from roll / new premium received) * 100
+    premium_efficiency = net_credit / mark * 100 if mark and mark > 0 else 0
+    
+    # Capital ROI: (net_credit / current_strike) * 100
+    capital_roi = net_credit * roi_scale
+    
+    # Annualized ROI: capital_roi * (365 / DTE)
+    days = opt['dte']
+    annualized_roi = capital_roi * 365 / days if days > 0 else 0
+    
+    return {
+        'type': opt_type,
+        'data': opt,
+        'net_credit': net_credit,
+        'net_delta': net_delta,
+        'premium_efficiency': premium_efficiency,
+        'capital_roi': capital_roi,
+        'annualized_roi': annualized_roi
+    }
+
+
+async def find_roll_options_async(ib, position, config):
     """
     Find multiple roll options for a position (call or put).
     
@@ -350,11 +598,7 @@ def find_roll_options(ib, position, config):
         Dictionary with roll options or None if position should be skipped
         Returns dict with 'error' key if critical data is missing
     """
-    import math
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    logger.info(f"[find_roll_options] Starting for {position.get('symbol')}")
+    logger.info("[find_roll_options] Starting for %s", position.get('symbol'))
     
     symbol = position['symbol']
     current_strike = position['strike']
@@ -364,7 +608,7 @@ def find_roll_options(ib, position, config):
     current_delta = position.get('current_delta')
     right = position.get('right', 'C')  # Default to call if not specified
     
-    logger.info(f"[find_roll_options] Symbol={symbol}, Strike={current_strike}, Expiry={current_expiry}, Right={right}")
+    logger.info("[find_roll_options] Symbol=%s, Strike=%s, Expiry=%s, Right=%s", symbol, current_strike, current_expiry, right)
     
     # Select appropriate target delta based on option type
     if right == 'P':
@@ -373,14 +617,14 @@ def find_roll_options(ib, position, config):
         target_delta = config.get('target_delta_call', 0.10)
     
     current_dte = dte(current_expiry)
-    logger.info(f"[find_roll_options] Current DTE={current_dte}, Target delta={target_delta}")
+    logger.info("[find_roll_options] Current DTE=%s, Target delta=%s", current_dte, target_delta)
     
     # Only check if within DTE threshold
     if current_dte > config['dte_threshold_for_alert']:
         return None
     
     # Critical data validation - check if current_mark is valid
-    if current_mark is None or (isinstance(current_mark, float) and math.isnan(current_mark)):
+    if is_missing(current_mark):
         # For positions expiring very soon (DTE <= 2), missing data is expected
         if current_dte <= 2:
             return {
@@ -406,19 +650,19 @@ def find_roll_options(ib, position, config):
     current_pnl = entry_credit - buyback_cost
     
     # Get spot price
-    logger.info(f"[find_roll_options] Getting stock price for {symbol}...")
-    spot = get_stock_price(ib, symbol)
-    logger.info(f"[find_roll_options] Stock price: {spot}")
+    logger.info("[find_roll_options] Getting stock price for %s...", symbol)
+    spot = await get_stock_price_async(ib, symbol)
+    logger.info("[find_roll_options] Stock price: %s", spot)
     
     # Warn if spot price is missing but continue (we can still find strikes)
-    if spot is None or (isinstance(spot, float) and math.isnan(spot)):
+    if is_missing(spot):
         spot = None  # Will impact strike selection quality
-        logger.warning(f"[find_roll_options] No spot price available for {symbol}")
+        logger.warning("[find_roll_options] No spot price available for %s", symbol)
     
     # Find next weekly expiry (pass the expiry date and option type)
-    logger.info(f"[find_roll_options] Finding next weekly expiry...")
-    next_expiry = get_next_weekly_expiry(ib, symbol, current_expiry, right)
-    logger.info(f"[find_roll_options] Next expiry: {next_expiry}")
+    logger.info("[find_roll_options] Finding next weekly expiry...")
+    next_expiry = await get_next_weekly_expiry_async(ib, symbol, current_expiry, right)
+    logger.info("[find_roll_options] Next expiry: %s", next_expiry)
     if not next_expiry:
         return {
             'error': 'no_expiry',
@@ -432,96 +676,58 @@ def find_roll_options(ib, position, config):
     options = []
     
     # Check if buyback_cost is valid
-    if buyback_cost is None or (isinstance(buyback_cost, float) and buyback_cost != buyback_cost):  # NaN check
+    if is_missing(buyback_cost):
         buyback_cost = 0  # Treat as zero if missing (likely expired option)
     
+    # The delta scan (options 2-4) quotes the current strike in the same
+    # batch as its sample, so the same-strike quote (option 1) is normally
+    # served from cache instead of needing its own subscription and wait
+    logger.info("[find_roll_options] Finding strikes by delta (target=%s)...", target_delta)
+    delta_tolerance = config.get('delta_tolerance', 0.03)
+    delta_options = await find_strikes_by_delta_async(ib, symbol, next_expiry, target_delta, spot, current_strike,
+                                                      right, delta_tolerance=delta_tolerance,
+                                                      also_quote=(current_strike,),
+                                                      iv=position.get('current_iv'))
+    logger.info("[find_roll_options] Getting same strike quote: %s...", current_strike)
+    same_strike = await get_option_quote_async(ib, symbol, next_expiry, current_strike, right=right)
+    
     # Option 1: Same strike roll
-    logger.info(f"[find_roll_options] Getting same strike quote: {current_strike}...")
-    same_strike = get_option_quote(ib, symbol, next_expiry, current_strike, right=right)
-    logger.info(f"[find_roll_options] Same strike result: {same_strike is not None}")
+    logger.info("[find_roll_options] Same strike result: %s", same_strike is not None)
+    # Capital ROI uses the current strike as a consistent capital base for
+    # every candidate, so its scale factor is computed once
+    roi_scale = 100 / current_strike if current_strike > 0 else 0
     if same_strike:
-        # Calculate net delta change: new_delta - current_delta
-        net_delta = None
-        if current_delta is not None and same_strike['delta'] is not None:
-            net_delta = same_strike['delta'] - current_delta
-        
-        net_credit = same_strike['mark'] - buyback_cost
-        
-        # Calculate Premium Efficiency: (net_credit from roll / new premium received) * 100
-        premium_efficiency = (net_credit / same_strike['mark'] * 100) if same_strike['mark'] and same_strike['mark'] > 0 else 0
-        
-        # Calculate Capital ROI: (net_credit / current_strike) * 100
-        # Uses current strike as consistent capital base
-        capital_roi = (net_credit / current_strike * 100) if current_strike > 0 else 0
-        
-        # Calculate Annualized ROI: capital_roi * (365 / DTE)
-        annualized_roi = (capital_roi * (365 / same_strike['dte'])) if same_strike['dte'] > 0 else 0
-        
-        # Only add if net credit is positive (profitable roll)
-        if net_credit > 0:
-            options.append({
-                'type': 'Same Strike',
-                'data': same_strike,
-                'net_credit': net_credit,
-                'net_delta': net_delta,
-                'premium_efficiency': premium_efficiency,
-                'capital_roi': capital_roi,
-                'annualized_roi': annualized_roi
-            })
-    
-    # Option 2-4: Find strikes by delta (will include some higher and lower)
-    logger.info(f"[find_roll_options] Finding strikes by delta (target={target_delta})...")
-    delta_tolerance = config.get('delta_tolerance', 0.03)
-    delta_options = find_strikes_by_delta(ib, symbol, next_expiry, target_delta, spot, current_strike, right, delta_tolerance=delta_tolerance)
-    logger.info(f"[find_roll_options] Found {len(delta_options)} delta options")
+        roll = _roll_option('Same Strike', same_strike, buyback_cost, current_delta, roi_scale)
+        if roll:
+            options.append(roll)
+    
+    # Option 2-4: Strikes by delta (will include some higher and lower)
+    logger.info("[find_roll_options] Found %s delta options", len(delta_options))
+    # Strikes already offered, bucketed to a $0.25 grid (fine enough for
+    # fractional strikes), so each candidate's duplicate check is a set lookup
+    seen_strikes = {round(o['data']['strike'] * 4) for o in options}
+    current_key = round(current_strike * 4)
     for opt in delta_options:
+        strike_key = round(opt['strike'] * 4)
+        # Only net-credit rolls are offered; drop the rest before labelling them
+        if strike_key in seen_strikes or opt['mark'] <= buyback_cost:
+            continue
+        
         # Categorize based on strike position
         # For calls: rolling up increases strike (more conservative)
         # For puts: rolling down decreases strike (more conservative)
-        if abs(opt['strike'] - current_strike) < 1.0:
+        move = opt['strike'] - current_strike
+        if strike_key == current_key:
             opt_type = 'Same Strike'
-        elif right == 'C':
-            # Call options
-            if opt['strike'] > current_strike:
-                opt_type = f"Roll Up (+${opt['strike'] - current_strike:.0f})"
-            else:
-                opt_type = f"Roll Down (-${current_strike - opt['strike']:.0f})"
+        elif move > 0:
+            opt_type = f"Roll Up (+${move:g})"
         else:
-            # Put options
-            if opt['strike'] < current_strike:
-                opt_type = f"Roll Down (-${current_strike - opt['strike']:.0f})"
-            else:
-                opt_type = f"Roll Up (+${opt['strike'] - current_strike:.0f})"
-        
-        net_credit = opt['mark'] - buyback_cost
-        
-        # Calculate net delta change: new_delta - current_delta
-        net_delta = None
-        if current_delta is not None and opt['delta'] is not None:
-            net_delta = opt['delta'] - current_delta
-        
-        # Calculate Premium Efficiency: (net_credit from roll / new premium received) * 100
-        premium_efficiency = (net_credit / opt['mark'] * 100) if opt['mark'] and opt['mark'] > 0 else 0
+            opt_type = f"Roll Down (-${-move:g})"
         
-        # Calculate Capital ROI: (net_credit / current_strike) * 100
-        capital_roi = (net_credit / current_strike * 100) if current_strike > 0 else 0
-        
-        # Calculate Annualized ROI: capital_roi * (365 / DTE)
-        annualized_roi = (capital_roi * (365 / opt['dte'])) if opt['dte'] > 0 else 0
-        
-        # Only add if not duplicate AND has positive net credit (profitable roll)
-        if not any(abs(o['data']['strike'] - opt['strike']) < 1.0 for o in options):
-            # Filter: Only include rolls with positive net credit
-            if net_credit > 0:
-                options.append({
-                    'type': opt_type,
-                    'data': opt,
-                    'net_credit': net_credit,
-                    'net_delta': net_delta,
-                    'premium_efficiency': premium_efficiency,
-                    'capital_roi': capital_roi,
-                    'annualized_roi': annualized_roi
-                })
+        roll = _roll_option(opt_type, opt, buyback_cost, current_delta, roi_scale)
+        if roll:
+            seen_strikes.add(strike_key)
+            options.append(roll)
     
     if not options:
         return None
@@ -540,3 +746,8 @@ def find_roll_options(ib, position, config):
         'right': right,  # Include option type for display
         'options': options
     }
+
+
+def find_roll_options(ib, position, config):
+    """Blocking version of find_roll_options_async()."""
+    return util.run(find_roll_options_async(ib, position, config))
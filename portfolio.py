@@ -1,90 +1,144 @@
 """
 Portfolio and position management.
 """
-from market_data import safe_mark, wait_for_greeks
-import time
+from ib_insync import util
+from market_data import safe_mark, wait_for_quote_and_greeks_async
+from utils import dte
+import asyncio
 
+__all__ = ['get_current_positions', 'get_current_positions_async']
 
-def get_current_positions(ib, retry_attempts=2, initial_wait=1.0):
+# Positions this many days beyond the alert threshold are listed without
+# market data: they are skipped by the roll search anyway
+_DTE_BUFFER = 5
+
+
+async def _position_data_async(ib, pos, retry_attempts):
     """
-    Fetch current short call and put positions from IBKR account.
+    Fetch mark, delta and implied volatility for one short option position.
     
     Args:
         ib: Connected IB instance
+        pos: Position from ib.positions() (contract has a conId and exchange)
         retry_attempts: Number of retry attempts for data retrieval
-        initial_wait: Initial wait time in seconds
     
     Returns:
-        List of position dictionaries
+        Position dictionary
     """
-    positions = []
-    account_positions = ib.positions()
+    contract = pos.contract
+    
+    # Try multiple times to get market data with Greeks
+    mark = None
+    delta = None
+    iv = None
+    ticker = None
     
-    for pos in account_positions:
-        contract = pos.contract
-        
-        # Include both short calls and short puts
-        if contract.secType == 'OPT' and pos.position < 0 and contract.right in ('C', 'P'):
-            if not contract.exchange or contract.exchange == '':
-                contract.exchange = 'SMART'
+    try:
+        for attempt in range(retry_attempts):
+            # Request Greeks (tick type 106) to get delta, unless the
+            # previous attempt kept its subscription open
+            if ticker is None:
+                ticker = ib.reqMktData(contract, '106', False, False)
             
-            ib.qualifyContracts(contract)
+            # Wait for bid/ask and Greeks together: up to 3.0s first attempt,
+            # 4.0s subsequent (returns as soon as both have arrived)
+            wait_time = 3.0 if attempt == 0 else 4.0
+            await wait_for_quote_and_greeks_async(ticker, timeout=wait_time)
             
-            # Try multiple times to get market data with Greeks
-            mark = None
-            delta = None
-            ticker = None
+            # Get mark price
+            mark = safe_mark(ticker)
             
-            for attempt in range(retry_attempts):
-                # Request Greeks (tick type 106) to get delta
-                ticker = ib.reqMktData(contract, '106', False, False)
-                
-                # Optimized wait times: 1.5s first attempt, 2.0s subsequent
-                wait_time = 1.5 if attempt == 0 else 2.0
-                ib.sleep(wait_time)
-                
-                # Additional wait specifically for Greeks to populate (reduced from 4.0s)
-                wait_for_greeks(ticker, timeout=2.5)
-                
-                # Get mark price
-                mark = safe_mark(ticker)
-                
-                # Get delta from Greeks
-                greeks = ticker.modelGreeks
-                delta = greeks.delta if greeks else None
-                
-                # Success: We have both mark price AND delta
-                if mark is not None and mark > 0 and delta is not None:
-                    break
-                
-                # Partial success: Have mark but no delta - keep trying
-                if mark is not None and mark > 0 and delta is None:
-                    # Wait a bit longer for Greeks on next attempt
-                    if attempt < retry_attempts - 1:
-                        ib.sleep(1.0)
-                        continue
-                
-                # No mark price yet - cancel and retry
-                if attempt < retry_attempts - 1:
-                    ib.cancelMktData(contract)
-                    ib.sleep(0.3)
+            # Get delta from Greeks
+            greeks = ticker.modelGreeks
+            delta = greeks.delta if greeks else None
+            iv = greeks.impliedVol if greeks else None
             
-            # Clean up market data subscription
-            if ticker:
-                ib.cancelMktData(contract)
+            # Success: We have both mark price AND delta
+            if mark is not None and mark > 0 and delta is not None:
+                break
             
-            avg_cost = pos.avgCost / 100
+            # Partial success: Have mark but no delta - keep waiting on the
+            # same subscription (re-requesting would leak this one)
+            if mark is not None and mark > 0:
+                continue
             
-            positions.append({
-                'symbol': contract.symbol,
-                'strike': contract.strike,
-                'expiry': contract.lastTradeDateOrContractMonth,
-                'right': contract.right,  # 'C' for call, 'P' for put
-                'contracts': abs(pos.position),
-                'entry_credit': abs(avg_cost),
-                'current_mark': mark,
-                'current_delta': delta,
-                'contract': contract
-            })
+            # No mark price yet - cancel and retry
+            if attempt < retry_attempts - 1:
+                ib.cancelMktData(contract)
+                ticker = None
+                await asyncio.sleep(0.3)
+    finally:
+        # Clean up market data subscription (exactly once)
+        if ticker is not None:
+            ib.cancelMktData(contract)
+    
+    return _position_dict(pos, mark, delta, iv)
+
+
+def _position_dict(pos, mark, delta, iv=None):
+    """Build the position dictionary for a short option position."""
+    contract = pos.contract
+    avg_cost = pos.avgCost / 100
+    
+    return {
+        'symbol': contract.symbol,
+        'strike': contract.strike,
+        'expiry': contract.lastTradeDateOrContractMonth,
+        'right': contract.right,  # 'C' for call, 'P' for put
+        'contracts': abs(pos.position),
+        'entry_credit': abs(avg_cost),
+        'current_mark': mark,
+        'current_delta': delta,
+        'current_iv': iv,
+        'contract': contract
+    }
+
+
+async def get_current_positions_async(ib, retry_attempts=2, initial_wait=1.0, dte_threshold=None, rights=('C', 'P')):
+    """
+    Fetch current short call and put positions from IBKR account.
+    
+    Market data for all positions is requested concurrently, so the total
+    wait is that of the slowest position rather than the sum of all.
+    
+    Args:
+        ib: Connected IB instance
+        retry_attempts: Number of retry attempts for data retrieval
+        initial_wait: Initial wait time in seconds
+        dte_threshold: Roll alert DTE threshold. Positions expiring well
+            beyond it get no market data (current_mark/current_delta None).
+            None fetches market data for every position.
+        rights: Option rights to include (default: both calls and puts)
     
-    return positions
+    Returns:
+        List of position dictionaries
+    """
+    # Short options of the requested rights (both calls and puts by default)
+    short_options = [pos for pos in ib.positions()
+                     if pos.contract.secType == 'OPT' and pos.position < 0 and pos.contract.right in rights]
+    if not short_options:
+        return []
+    
+    if dte_threshold is None:
+        near = short_options
+    else:
+        near = [pos for pos in short_options
+                if dte(pos.contract.lastTradeDateOrContractMonth) <= dte_threshold + _DTE_BUFFER]
+    
+    for pos in near:
+        if not pos.contract.exchange:
+            pos.contract.exchange = 'SMART'
+    # Position contracts normally arrive with their conId, which is all
+    # reqMktData needs; only the rest are qualified (in one batch)
+    unqualified = [pos.contract for pos in near if not pos.contract.conId]
+    if unqualified:
+        await ib.qualifyContractsAsync(*unqualified)
+    
+    fetched = await asyncio.gather(*(_position_data_async(ib, pos, retry_attempts) for pos in near))
+    by_pos = dict(zip(map(id, near), fetched))
+    return [by_pos.get(id(pos)) or _position_dict(pos, None, None) for pos in short_options]
+
+
+def get_current_positions(ib, retry_attempts=2, initial_wait=1.0, dte_threshold=None, rights=('C', 'P')):
+    """Blocking version of get_current_positions_async()."""
+    return util.run(get_current_positions_async(ib, retry_attempts, initial_wait, dte_threshold, rights))
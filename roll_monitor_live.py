@@ -5,21 +5,37 @@ Shows real-time updating display of positions and roll options.
 """
 
 from datetime import datetime, timezone
-import argparse
+import asyncio
+import logging
 import time
 import sys
 import select
 import threading
+import traceback
 
+from ib_insync import util
 from rich.live import Live
 from rich.console import Console
 
-from ib_connection import connect_ib, disconnect_ib
+from ib_connection import connect_ib, ensure_connected, disconnect_ib
 from portfolio import get_current_positions
-from options_finder import find_roll_options
+from options_finder import find_roll_options_async
 from display_live import LiveMonitor
+from greeks_cache import get_cache
+from monitor_core import (build_arg_parser, setup_logging, build_config, fetch_positions,
+                          prefetch_underlyings_async, account_underlyings_to_scan, LOG_FILE)
+from market_data import wait_for_price_move_async
 from utils import dte, get_market_status
 
+# Positions analyzed at once. Each holds up to ~12 option subscriptions while
+# scanning, which keeps us well under IB's default 100 market data lines.
+MAX_CONCURRENT_POSITIONS = 4
+
+# Per-position analysis time limit in seconds (large option chains are slow)
+POSITION_TIMEOUT = 150
+
+logger = logging.getLogger(__name__)
+
 
 class InputMonitor:
     """Monitor for user input to stop the program."""
@@ -51,49 +67,32 @@ class InputMonitor:
             return self.should_stop
 
 
-def process_position(ib, pos, config):
+async def process_position_async(ib, pos, config):
     """
     Process a single position and return result with timeout protection.
     
     Returns:
         tuple: (result_type, data)
     """
-    import signal
-    import logging
-    
-    # Get logger (configuration done in main())
-    logger = logging.getLogger(__name__)
-    
-    logger.info(f"="*80)
-    logger.info(f"Starting analysis for position: {pos.get('symbol')} ${pos.get('strike')}{pos.get('right')} exp={pos.get('expiry')}")
-    logger.info(f"Position details: {pos}")
-    
-    def timeout_handler(signum, frame):
-        logger.error("TIMEOUT: Position analysis exceeded 150 seconds!")
-        raise TimeoutError("Position analysis timed out")
+    logger.info("=" * 80)
+    logger.info("Starting analysis for position: %s $%s%s exp=%s", pos.get('symbol'), pos.get('strike'), pos.get('right'), pos.get('expiry'))
+    logger.info("Position details: %s", pos)
     
     try:
-        # Set 150-second alarm for entire position analysis (increased for large option chains)
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(150)
-        
         logger.info("Calling find_roll_options...")
-        roll_info = find_roll_options(ib, pos, config)
-        logger.info(f"find_roll_options returned: {roll_info}")
-        
-        # Cancel alarm if completed
-        signal.alarm(0)
+        roll_info = await asyncio.wait_for(find_roll_options_async(ib, pos, config), POSITION_TIMEOUT)
+        logger.info("find_roll_options returned: %s", roll_info)
         
         if not roll_info:
             current_dte = dte(pos['expiry'])
-            logger.info(f"No roll info returned, DTE={current_dte}")
+            logger.info("No roll info returned, DTE=%s", current_dte)
             if current_dte > config['dte_threshold_for_alert']:
                 return 'not_ready', None
             return 'no_options', None
         
         if 'error' in roll_info:
             error_type = roll_info['error']
-            logger.warning(f"Roll info contains error: {error_type}")
+            logger.warning("Roll info contains error: %s", error_type)
             if error_type == 'skip_expiring':
                 return 'skip_expiring', None
             else:
@@ -102,31 +101,96 @@ def process_position(ib, pos, config):
         logger.info("Position analysis completed successfully!")
         return 'options_found', roll_info
         
-    except TimeoutError as e:
-        signal.alarm(0)  # Cancel alarm
-        logger.error(f"TimeoutError caught: {e}")
+    except asyncio.TimeoutError:
+        logger.error("TIMEOUT: Position analysis exceeded %s seconds!", POSITION_TIMEOUT)
         return 'exception', None
     except Exception as e:
-        signal.alarm(0)  # Cancel alarm
-        logger.error(f"Exception caught: {type(e).__name__}: {e}", exc_info=True)
+        logger.error("Exception caught: %s: %s", type(e).__name__, e, exc_info=True)
         return 'exception', None
 
 
-def run_single_check(args, config, monitor, live=None):
+async def process_positions_async(ib, positions, config, on_result):
+    """
+    Process positions concurrently, at most MAX_CONCURRENT_POSITIONS at a time.
+    
+    Each position's IB round-trips (spot, chain, quotes) overlap with the
+    others', so a scan takes about as long as the slowest position instead
+    of the sum of all of them.
+    
+    Args:
+        ib: Connected IB instance
+        positions: Positions to analyze
+        config: Configuration dictionary
+        on_result: Called as on_result(index, pos, result_type, data) as each
+            position finishes (index is the position's place in positions)
+    """
+    await prefetch_underlyings_async(ib, positions, config)
+    
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_POSITIONS)
+    
+    async def run(idx, pos):
+        async with semaphore:
+            result_type, data = await process_position_async(ib, pos, config)
+        on_result(idx, pos, result_type, data)
+    
+    await asyncio.gather(*(run(idx, pos) for idx, pos in enumerate(positions)))
+
+
+async def _countdown_async(ib, symbols, seconds, on_tick):
+    """
+    Count down to the next check, ending early if an underlying moves.
+    
+    Runs on the IB event loop, so the connection is serviced meanwhile and
+    a drop is noticed.
+    
+    Args:
+        ib: IB instance (None if not connected)
+        symbols: Underlyings whose moves end the countdown (may be empty)
+        seconds: Countdown length
+        on_tick: Called with the remaining seconds once a second; returning
+            True stops the countdown
+    
+    Returns:
+        True if an underlying moved
+    """
+    watch = None
+    if symbols and ib is not None and ib.isConnected():
+        watch = asyncio.ensure_future(wait_for_price_move_async(ib, symbols, timeout=seconds))
+    try:
+        for remaining in range(seconds, 0, -1):
+            if on_tick(remaining):
+                return False
+            if watch is None:
+                await asyncio.sleep(1)
+                continue
+            done, _ = await asyncio.wait([watch], timeout=1)
+            if done:
+                if watch.exception() is None and watch.result():
+                    return True
+                watch = None
+        return False
+    finally:
+        if watch is not None and not watch.done():
+            watch.cancel()
+            await asyncio.gather(watch, return_exceptions=True)
+
+
+def run_single_check(args, config, monitor, ib, live=None):
     """
     Run a single check iteration and update the monitor display.
     
     Args:
+        ib: IB instance kept open between checks (reconnected here if it dropped)
         live: Optional Live display object for forcing updates
     
     Returns:
-        bool: True if check completed successfully
+        (success, ib): True if check completed successfully, and the IB
+        instance to use for the next check
     """
     # Debug logging to file
     if args.verbose:
-        with open('/tmp/roll_monitor_debug.log', 'a') as f:
-            import datetime
-            f.write(f"\n{datetime.datetime.now()}: Starting run_single_check\n")
+        with open(LOG_FILE, 'a') as f:
+            f.write(f"\n{datetime.now()}: Starting run_single_check\n")
     
     # Check market hours
     if not args.skip_market_check:
@@ -134,54 +198,56 @@ def run_single_check(args, config, monitor, live=None):
         monitor.update_status(market_status=market_status)
         
         if args.verbose:
-            with open('/tmp/roll_monitor_debug.log', 'a') as f:
+            with open(LOG_FILE, 'a') as f:
                 f.write(f"  Market status: {market_status}\n")
         
         if not market_status['is_open']:
             monitor.update_summary(positions_count=0)
-            return False
+            return False, ib
     
-    # Connect to IBKR
-    if args.verbose:
-        with open('/tmp/roll_monitor_debug.log', 'a') as f:
-            f.write("  Connecting to IBKR...\n")
-    try:
-        ib = connect_ib(args.host, args.port, args.clientId, realtime=args.realtime)
-        monitor.update_status(connected=True, host=args.host, port=args.port)
+    # Reconnect to IBKR only if the connection dropped
+    if ib is None or not ib.isConnected():
         if args.verbose:
-            with open('/tmp/roll_monitor_debug.log', 'a') as f:
-                f.write("  Connected successfully\n")
-    except Exception as e:
-        if args.verbose:
-            with open('/tmp/roll_monitor_debug.log', 'a') as f:
-                f.write(f"  Connection failed: {e}\n")
-        monitor.update_status(connected=False)
-        return False
+            with open(LOG_FILE, 'a') as f:
+                f.write("  Connecting to IBKR...\n")
+        try:
+            ib = ensure_connected(ib, args.host, args.port, args.clientId, realtime=args.realtime)
+            if args.verbose:
+                with open(LOG_FILE, 'a') as f:
+                    f.write("  Connected successfully\n")
+        except Exception as e:
+            if args.verbose:
+                with open(LOG_FILE, 'a') as f:
+                    f.write(f"  Connection failed: {e}\n")
+            monitor.update_status(connected=False)
+            return False, ib
+    monitor.update_status(connected=True, host=args.host, port=args.port)
     
     try:
         # Get positions (increased retries for better Greeks data)
         monitor.update_status(activity="Fetching positions...")
         if args.verbose:
-            with open('/tmp/roll_monitor_debug.log', 'a') as f:
+            with open(LOG_FILE, 'a') as f:
                 f.write("  Fetching positions...\n")
-        positions = get_current_positions(ib, retry_attempts=2)  # Optimized retry attempts
+        # Underlying prices are fetched alongside the positions' quotes
+        positions = fetch_positions(ib, config, retry_attempts=2)
         if args.verbose:
-            with open('/tmp/roll_monitor_debug.log', 'a') as f:
+            with open(LOG_FILE, 'a') as f:
                 f.write(f"  Got {len(positions)} positions\n")
         monitor.update_positions(positions)
         monitor.update_status(activity=None)
         
         # Force display update to show positions immediately
         if live:
-            live.update(monitor.render())
+            monitor.refresh(live)
         
         if not positions:
             monitor.update_summary(positions_count=0)
             monitor.update_status(activity=None)
-            return True
+            return True, ib
         
-        # Process each position
-        roll_opportunities = []
+        # Process all positions concurrently
+        found = [None] * len(positions)
         counters = {
             'options_found': 0,
             'skip_expiring': 0,
@@ -191,33 +257,34 @@ def run_single_check(args, config, monitor, live=None):
             'no_options': 0
         }
         
-        for idx, pos in enumerate(positions, 1):
-            # Update progress indicator
-            monitor.update_status(activity=f"Analyzing position {idx}/{len(positions)}: {pos['symbol']} ${pos['strike']:.0f}{pos['right']}...")
-            if live:
-                live.update(monitor.render())
-                time.sleep(0.1)  # Small delay to reduce flicker
-            
-            result_type, data = process_position(ib, pos, config)
+        monitor.update_status(activity=f"Analyzing {len(positions)} position(s)...")
+        if live:
+            monitor.refresh(live)
+        
+        def on_result(idx, pos, result_type, data):
             counters[result_type] += 1
+            done = sum(counters.values())
+            monitor.update_status(activity=f"Analyzed {done}/{len(positions)}: {pos['symbol']} ${pos['strike']:.0f}{pos['right']}")
             
             if result_type == 'options_found' and data:
-                roll_opportunities.append(data)
-                # PROGRESSIVE DISPLAY: Update immediately after each position
-                monitor.update_roll_opportunities(roll_opportunities)
+                found[idx] = data
+                # PROGRESSIVE DISPLAY: Update as soon as each position finishes
+                # (kept in position order regardless of completion order)
+                monitor.update_roll_opportunities([r for r in found if r is not None])
                 monitor.update_summary(
                     positions_count=len(positions),
                     options_found=counters['options_found'],
                     skipped_expiring=counters['skip_expiring'],
                     errors=counters['error'] + counters['exception']
                 )
-                if live:
-                    live.update(monitor.render())
-                    time.sleep(0.1)  # Small delay to reduce flicker
+            if live:
+                monitor.refresh(live)
+        
+        util.run(process_positions_async(ib, positions, config, on_result))
+        roll_opportunities = [r for r in found if r is not None]
         
         # Update display with results
         # Get cache statistics
-        from greeks_cache import get_cache
         cache = get_cache()
         cache_stats = cache.get_stats()
         
@@ -230,64 +297,28 @@ def run_single_check(args, config, monitor, live=None):
             errors=counters['error'] + counters['exception']
         )
         
-        return True
+        return True, ib
         
     except Exception as e:
         if args.verbose:
-            with open('/tmp/roll_monitor_debug.log', 'a') as f:
-                import traceback
+            with open(LOG_FILE, 'a') as f:
                 f.write(f"  EXCEPTION in run_single_check: {e}\n")
                 f.write(traceback.format_exc())
         monitor.update_summary(positions_count=0, errors=1)
-        return False
-        
-    finally:
-        disconnect_ib(ib)
-        monitor.update_status(connected=False)
+        return False, ib
 
 
 def main():
     """Main entry point for the live roll monitor."""
-    ap = argparse.ArgumentParser(description="Live monitor for covered calls and cash-secured puts.")
-    ap.add_argument("--host", default="127.0.0.1")
-    ap.add_argument("--port", type=int, default=7496)
-    ap.add_argument("--clientId", type=int, default=2)
-    ap.add_argument("--target-delta-call", type=float, default=0.10, help="Target delta for covered calls")
-    ap.add_argument("--target-delta-put", type=float, default=-0.90, help="Target delta for cash-secured puts")
-    ap.add_argument("--delta-tolerance", type=float, default=0.03, help="Max delta deviation from target (default: 0.03, i.e., ±3 percentage points)")
-    ap.add_argument("--dte-threshold", type=int, default=45, help="Alert when DTE <= this (default: 45 for weekly rolling)")
-    ap.add_argument("--interval", type=int, default=240, help="Check interval in seconds when market open (default: 240 = 4 minutes, auto-extends to 30min when closed)")
+    ap = build_arg_parser("Live monitor for covered calls and cash-secured puts.",
+                          "Check interval in seconds when market open (default: 240 = 4 minutes, auto-extends to 30min when closed)")
     ap.add_argument("--max-rolls", type=int, default=2, help="Max rolls to show per position (0=all, default: 2)")
-    ap.add_argument("--once", action="store_true", help="Run only once")
-    ap.add_argument("--skip-market-check", action="store_true", help="Skip market hours check")
-    ap.add_argument("--verbose", "-v", action="store_true", help="Enable additional workflow logging")
-    ap.add_argument("--log-level", choices=['ERROR', 'WARNING', 'INFO', 'DEBUG'], default='INFO',
-                    help="Logging level (default: INFO)")
-    ap.add_argument("--realtime", action="store_true", default=False, help="Use real-time market data (requires subscription, default: delayed)")
     args = ap.parse_args()
     
     # Setup logging once at startup
-    import logging
-    log_level = getattr(logging, args.log_level)
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s [%(levelname)s] %(message)s',
-        handlers=[
-            logging.FileHandler('/tmp/roll_monitor_debug.log'),
-        ]
-    )
-    # Suppress verbose ib_insync logging
-    logging.getLogger('ib_insync').setLevel(logging.WARNING)
+    setup_logging(args.log_level)
     
-    config = {
-        'target_delta_call': args.target_delta_call,
-        'target_delta_put': args.target_delta_put,
-        'delta_tolerance': args.delta_tolerance,
-        'dte_threshold_for_alert': args.dte_threshold,
-        'check_interval_seconds': args.interval,
-        'max_rolls_per_position': args.max_rolls,
-        'verbose': args.verbose
-    }
+    config = build_config(args)
     
     # Create live monitor
     monitor = LiveMonitor(config)
@@ -301,6 +332,7 @@ def main():
     # Do the initial connection and data fetch BEFORE starting Live display
     # This avoids showing empty tables while waiting for data
     initial_success = False
+    ib = None
     try:
         ib = connect_ib(args.host, args.port, args.clientId, realtime=args.realtime)
         monitor.update_status(connected=True, host=args.host, port=args.port)
@@ -312,15 +344,16 @@ def main():
         
         # Fetch initial positions
         console.print("[cyan]Fetching your positions...[/cyan]")
-        positions = get_current_positions(ib, retry_attempts=2)
+        positions = get_current_positions(ib, retry_attempts=2, dte_threshold=config['dte_threshold_for_alert'])
         monitor.update_positions(positions)
         console.print(f"[green]✓ Found {len(positions)} short option position(s)[/green]\n")
         
-        disconnect_ib(ib)
-        monitor.update_status(connected=False)
+        # The connection stays open for every later check
         initial_success = True
     except Exception as e:
         console.print(f"[red]✗ Initial connection failed: {e}[/red]\n")
+        if ib:
+            disconnect_ib(ib)
         return
     
     if not initial_success:
@@ -340,40 +373,41 @@ def main():
             pass  # If we can't set it, continue without input monitoring
     
     try:
-        with Live(monitor.render(), console=console, refresh_per_second=1, transient=False) as live:
+        # No auto-refresh: monitor.refresh() redraws only when data changed
+        with Live(monitor.render(), console=console, auto_refresh=False, transient=False) as live:
             iteration = 0
             
             if args.verbose:
-                with open('/tmp/roll_monitor_debug.log', 'a') as f:
+                with open(LOG_FILE, 'a') as f:
                     f.write("Entered Live context\n")
             
             while True:
                 iteration += 1
                 
                 if args.verbose:
-                    with open('/tmp/roll_monitor_debug.log', 'a') as f:
+                    with open(LOG_FILE, 'a') as f:
                         f.write(f"Iteration {iteration} starting\n")
                 
                 # Run check immediately on first iteration or after countdown
                 monitor.update_status(next_check_seconds=0)
-                live.update(monitor.render())
+                monitor.refresh(live)
                 
                 if args.verbose:
-                    with open('/tmp/roll_monitor_debug.log', 'a') as f:
+                    with open(LOG_FILE, 'a') as f:
                         f.write("About to call run_single_check\n")
                 
-                success = run_single_check(args, config, monitor, live)
+                success, ib = run_single_check(args, config, monitor, ib, live)
                 
                 if args.verbose:
-                    with open('/tmp/roll_monitor_debug.log', 'a') as f:
+                    with open(LOG_FILE, 'a') as f:
                         f.write(f"run_single_check returned: {success}\n")
                 
                 # Force display update after check
-                live.update(monitor.render())
+                monitor.refresh(live)
                 
                 if args.verbose:
-                    with open('/tmp/roll_monitor_debug.log', 'a') as f:
-                        f.write("Called live.update after check\n")
+                    with open(LOG_FILE, 'a') as f:
+                        f.write("Called monitor.refresh after check\n")
                 
                 if args.once:
                     time.sleep(3)  # Show final results for 3 seconds
@@ -381,10 +415,12 @@ def main():
                 
                 # Determine sleep interval based on market status
                 # Use longer interval when market is closed to reduce unnecessary checks
+                market_open = True
                 if not args.skip_market_check:
                     market_status = get_market_status()
                     monitor.update_status(market_status=market_status)
-                    if not market_status['is_open']:
+                    market_open = market_status['is_open']
+                    if not market_open:
                         # Market closed: use 30-minute interval (or user interval if longer)
                         sleep_interval = max(1800, config['check_interval_seconds'])
                     else:
@@ -393,17 +429,24 @@ def main():
                 else:
                     sleep_interval = config['check_interval_seconds']
                 
-                # Countdown to next check
-                for remaining in range(sleep_interval, 0, -1):
+                # Countdown to next check, cut short when an underlying moves
+                # (only watched while the market is open)
+                watch_symbols = set()
+                if market_open and ib is not None and ib.isConnected():
+                    watch_symbols = account_underlyings_to_scan(ib, config)
+                
+                def on_tick(remaining):
                     # Check for quit command
                     input_monitor.check_input()
                     if input_monitor.stop_requested():
                         console.print("\n\n[yellow]Stop requested by user[/yellow]")
-                        break
+                        return True
                     
                     monitor.update_status(next_check_seconds=remaining)
-                    live.update(monitor.render())
-                    time.sleep(1)
+                    monitor.refresh(live)
+                    return False
+                
+                util.run(_countdown_async(ib, watch_symbols, sleep_interval, on_tick))
                 
                 # Break outer loop if stop was requested
                 if input_monitor.stop_requested():
@@ -412,6 +455,7 @@ def main():
     except KeyboardInterrupt:
         console.print("\n\n[yellow]Monitoring stopped by user (Ctrl+C)[/yellow]")
     finally:
+        disconnect_ib(ib)
         # Restore terminal settings on Unix systems
         if sys.platform != 'win32':
             try:
@@ -6,15 +6,22 @@ Reads positions directly from your IBKR account.
 
 from ib_insync import *
 from datetime import datetime, timezone
+from functools import lru_cache
 import argparse
 import time
 import math
 
+import portfolio
+from market_data import wait_for_greeks
+
 FALLBACK_EXCHANGES = ["SMART", "CBOE"]
 
+@lru_cache(maxsize=1024)
+def _parse_expiry(yyyymmdd: str):
+    return datetime.strptime(yyyymmdd, "%Y%m%d").date()
+
 def dte(yyyymmdd: str) -> int:
-    dt = datetime.strptime(yyyymmdd, "%Y%m%d").date()
-    return (dt - datetime.now(timezone.utc).date()).days
+    return (_parse_expiry(yyyymmdd) - datetime.now(timezone.utc).date()).days
 
 def pick_expiry(expiries, target=40, window=(30, 45)):
     expiries = sorted(expiries)
@@ -36,51 +43,10 @@ def safe_mark(tk: Ticker):
         return (bid + ask) / 2
     return bid or ask or tk.last or tk.close
 
-def wait_for_greeks(tk: Ticker, timeout=3.0):
-    end = time.time() + timeout
-    while time.time() < end:
-        if tk.modelGreeks and tk.modelGreeks.delta is not None:
-            return True
-        time.sleep(0.12)
-    return False
-
 def get_current_positions(ib):
-    """Fetch current option positions from IBKR account."""
-    positions = []
-    
-    # Get all positions
-    account_positions = ib.positions()
-    
-    for pos in account_positions:
-        contract = pos.contract
-        
-        # Only look at short option positions (negative quantity = short)
-        if contract.secType == 'OPT' and pos.position < 0 and contract.right == 'C':
-            # Set exchange to SMART for market data if not already set
-            if not contract.exchange or contract.exchange == '':
-                contract.exchange = 'SMART'
-            
-            # Qualify the contract first
-            ib.qualifyContracts(contract)
-            
-            # Get current market value
-            ticker = ib.reqMktData(contract, '', False, False)
-            ib.sleep(0.5)
-            
-            mark = safe_mark(ticker)
-            avg_cost = pos.avgCost / 100  # avgCost is per share, divide by 100 for per contract
-            
-            positions.append({
-                'symbol': contract.symbol,
-                'strike': contract.strike,
-                'expiry': contract.lastTradeDateOrContractMonth,
-                'contracts': abs(pos.position),
-                'entry_credit': abs(avg_cost),  # positive value for credit received
-                'current_mark': mark,
-                'contract': contract
-            })
-    
-    return positions
+    """Fetch current short call positions from IBKR account."""
+    # Covered calls only; fetching is shared with the modular monitors
+    return portfolio.get_current_positions(ib, rights=('C',))
 
 def find_target_option(ib, symbol, target_dte, target_delta, spot=None, timeout=2.5):
     """Find option near target DTE and delta."""
@@ -125,10 +91,11 @@ def find_target_option(ib, symbol, target_dte, target_delta, spot=None, timeout=
             continue
         
         opt = Option(symbol, expiry, k, 'C', exchange=chain_ex, currency='USD', tradingClass=symbol)
+        tk = None
         try:
             ib.qualifyContracts(opt)
             tk = ib.reqMktData(opt, "106", False, False)
-            ib.sleep(0.35)
+            # Returns as soon as the Greeks arrive
             wait_for_greeks(tk, timeout=timeout)
             
             mark = safe_mark(tk)
@@ -153,6 +120,10 @@ def find_target_option(ib, symbol, target_dte, target_delta, spot=None, timeout=
             })
         except Exception:
             continue
+        finally:
+            # Streaming subscriptions hold a market data line until cancelled
+            if tk is not None:
+                ib.cancelMktData(opt)
     
     if not rows:
         return None
@@ -191,6 +162,7 @@ def check_roll_opportunity(ib, position, config):
     stkt = ib.reqMktData(stk, '', False, False)
     ib.sleep(0.6)
     spot = safe_mark(stkt)
+    ib.cancelMktData(stk)
     
     # Find new target option
     new_option = find_target_option(ib, symbol, config['target_dte'], config['target_delta'], spot)
@@ -2,13 +2,17 @@
 
 from ib_insync import *
 from datetime import datetime, timezone
-import argparse, time, math
+from functools import lru_cache
+import argparse, asyncio, math
 
 FALLBACK_EXCHANGES = ["SMART", "CBOE"]  # try in this order
 
+@lru_cache(maxsize=1024)
+def _parse_expiry(yyyymmdd: str):
+    return datetime.strptime(yyyymmdd, "%Y%m%d").date()
+
 def dte(yyyymmdd: str) -> int:
-    dt = datetime.strptime(yyyymmdd, "%Y%m%d").date()
-    return (dt - datetime.now(timezone.utc).date()).days
+    return (_parse_expiry(yyyymmdd) - datetime.now(timezone.utc).date()).days
 
 def pick_expiry(expiries, target=40, window=(30, 55)):
     expiries = sorted(expiries)
@@ -30,13 +34,29 @@ def safe_mark(tk: Ticker):
         return (bid + ask) / 2
     return bid or ask or tk.last or tk.close
 
+def has_greeks(tk: Ticker):
+    return tk.modelGreeks is not None and tk.modelGreeks.delta is not None
+
+async def wait_for_greeks_async(tk: Ticker, timeout=3.0):
+    # wake on the ticker's own updates instead of polling (a blocking sleep
+    # would also stall the IB event loop that delivers them)
+    if has_greeks(tk):
+        return True
+    evt = asyncio.Event()
+    def on_update(t):
+        if has_greeks(t):
+            evt.set()
+    tk.updateEvent += on_update
+    try:
+        await asyncio.wait_for(evt.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        tk.updateEvent -= on_update
+
 def wait_for_greeks(tk: Ticker, timeout=3.0):
-    end = time.time() + timeout
-    while time.time() < end:
-        if tk.modelGreeks and tk.modelGreeks.delta is not None:
-            return True
-        time.sleep(0.12)
-    return False
+    return util.run(wait_for_greeks_async(tk, timeout))
 
 def main():
     ap = argparse.ArgumentParser(description="Pick MSTR ~targetDelta call near ~targetDTE (read-only).")
@@ -61,6 +81,7 @@ def main():
 
     stkt = ib.reqMktData(stk, '', False, False); ib.sleep(0.6)
     spot = safe_mark(stkt)
+    ib.cancelMktData(stk)  # free the market data line
     if spot:
         print(f"{args.symbol} spot ~ {spot:.2f}")
     else:
@@ -133,6 +154,8 @@ def main():
             mark = safe_mark(tk)
             greeks = tk.modelGreeks
             delta = greeks.delta if greeks else None
+            # Values are read; release the line so the scan stays under IB's limit
+            ib.cancelMktData(opt)
 
             if delta is None:
                 continue  # skip if we didn’t get delta; delayed farms can be slow
@@ -177,11 +177,11 @@ def main():
     )
     
     try:
-        with Live(monitor.render(), console=console, refresh_per_second=2) as live:
+        with Live(monitor.render(), console=console, auto_refresh=False) as live:
             # Countdown demo
             for seconds in range(15, 0, -1):
                 monitor.update_status(next_check_seconds=seconds)
-                live.update(monitor.render())
+                monitor.refresh(live)
                 time.sleep(1)
             
             console.print("\n[green]Demo complete! This is what the live monitor will look like.[/green]")
@@ -9,10 +9,13 @@ def test_imports():
     try:
         import utils
         import ib_connection
+        import contracts_pool
         import market_data
         import portfolio
         import options_finder
         import display
+        import monitor_core
+        import greeks
         print("  ✓ All modules imported successfully")
         return True
     except ImportError as e:
@@ -23,7 +26,7 @@ def test_imports():
 def test_utils():
     """Test utils module functions."""
     print("\nTesting utils module...")
-    from utils import dte, FALLBACK_EXCHANGES
+    from utils import dte, is_missing, FALLBACK_EXCHANGES
     from datetime import datetime, timezone
     
     # Test DTE calculation
@@ -37,6 +40,57 @@ def test_utils():
     assert len(FALLBACK_EXCHANGES) > 0, "FALLBACK_EXCHANGES should not be empty"
     print(f"  ✓ FALLBACK_EXCHANGES = {FALLBACK_EXCHANGES}")
     
+    # Test missing-number detection
+    assert is_missing(None) and is_missing(float('nan')) and is_missing(float('inf'))
+    assert not is_missing(0.0) and not is_missing(1)
+    print("  ✓ is_missing()")
+    
+    return True
+
+
+def test_greeks():
+    """Test Black-Scholes delta estimates."""
+    print("\nTesting greeks module...")
+    from greeks import estimate_deltas
+    
+    # ATM, 1 year, 20% vol, 4% rate: d1 = 0.3, N(0.3) ~ 0.618
+    call, = estimate_deltas(100.0, [100.0], 1.0, 0.20, 'C')
+    assert abs(call - 0.618) < 0.001, f"Expected call delta ~0.618, got {call:.4f}"
+    print(f"  ✓ ATM call delta = {call:.3f}")
+    
+    # Put-call parity: put delta = call delta - 1
+    put, = estimate_deltas(100.0, [100.0], 1.0, 0.20, 'P')
+    assert abs(put - (call - 1)) < 1e-12, f"Expected put delta {call - 1:.4f}, got {put:.4f}"
+    print(f"  ✓ ATM put delta = {put:.3f}")
+    
+    return True
+
+
+def test_roll_expiry():
+    """Test roll expiry selection within the 30-60 DTE window."""
+    print("\nTesting roll expiry selection...")
+    from options_finder import _select_roll_expiry
+    from datetime import datetime, timedelta, timezone
+    
+    today = datetime.now(timezone.utc).date()
+    day = lambda n: (today + timedelta(days=n)).strftime("%Y%m%d")
+    expiries = [day(n) for n in (20, 35, 45, 55, 70)]
+    
+    # Target before today+30: the window starts at 30 DTE
+    result = _select_roll_expiry("TEST", expiries, today + timedelta(days=10))
+    assert result == day(35), f"Expected {day(35)}, got {result}"
+    print(f"  ✓ target below 30 DTE -> {result}")
+    
+    # Target after today+30: the window starts at the target
+    result = _select_roll_expiry("TEST", expiries, today + timedelta(days=40))
+    assert result == day(45), f"Expected {day(45)}, got {result}"
+    print(f"  ✓ target above 30 DTE -> {result}")
+    
+    # No expiry between the target and 60 DTE
+    result = _select_roll_expiry("TEST", expiries, today + timedelta(days=58))
+    assert result is None, f"Expected None, got {result}"
+    print("  ✓ empty window -> None")
+    
     return True
 
 
@@ -45,11 +99,24 @@ def test_module_functions():
     print("\nTesting module functions exist...")
     
     tests = [
-        ("ib_connection", ["connect_ib", "disconnect_ib"]),
-        ("market_data", ["safe_mark", "wait_for_greeks", "get_option_quote", "get_stock_price"]),
-        ("portfolio", ["get_current_positions"]),
-        ("options_finder", ["get_next_weekly_expiry", "find_strikes_by_delta", "find_roll_options"]),
+        ("ib_connection", ["connect_ib", "ensure_connected", "disconnect_ib"]),
+        ("contracts_pool", ["qualify_options", "qualify_options_async", "qualify_stock", "qualify_stock_async",
+                            "clear_pool"]),
+        ("market_data", ["safe_mark", "safe_mark_verbose", "wait_for_greeks", "wait_for_greeks_async", "wait_for_any_greeks_async", "wait_for_all_greeks_async",
+                         "wait_for_quote", "wait_for_quote_async", "wait_for_quote_and_greeks_async",
+                         "get_option_quote", "get_option_quote_async", "get_option_quotes", "get_option_quotes_async",
+                         "get_stock_price", "get_stock_price_async", "get_stock_prices", "get_stock_prices_async", "get_stock_contract", "get_stock_contract_async",
+                         "wait_for_price_move", "wait_for_price_move_async", "single_flight_async",
+                         "unlisted_strikes", "clear_unlisted_strikes"]),
+        ("portfolio", ["get_current_positions", "get_current_positions_async"]),
+        ("options_finder", ["get_next_weekly_expiry", "get_next_weekly_expiry_async", "find_strikes_by_delta",
+                            "find_strikes_by_delta_async", "find_roll_options", "find_roll_options_async",
+                            "clear_option_caches"]),
         ("display", ["print_roll_options", "print_positions_summary"]),
+        ("greeks", ["estimate_deltas"]),
+        ("monitor_core", ["build_arg_parser", "setup_logging", "build_config", "underlyings_to_scan",
+                          "account_underlyings_to_scan", "fetch_positions", "fetch_positions_async",
+                          "prefetch_underlyings_async"]),
     ]
     
     for module_name, functions in tests:
@@ -62,6 +129,39 @@ def test_module_functions():
     return True
 
 
+def test_shared_subscriptions():
+    """Test that shared market data subscriptions are cancelled with the subscribing contract."""
+    print("\nTesting shared market data subscriptions...")
+    from ib_insync import Option
+    import market_data
+    
+    class StubIB:
+        """Tracks requests by contract object, like ib_insync."""
+        def __init__(self):
+            self.live = {}
+        
+        def reqMktData(self, contract, *args):
+            self.live[id(contract)] = object()
+            return self.live[id(contract)]
+        
+        def cancelMktData(self, contract):
+            self.live.pop(id(contract), None)
+    
+    ib = StubIB()
+    smart = Option('XYZ', '20300118', 100, 'C', 'SMART', conId=424242)
+    cboe = Option('XYZ', '20300118', 100, 'C', 'CBOE', conId=424242)
+    assert market_data._subscribe(ib, smart) is market_data._subscribe(ib, cboe)
+    assert len(ib.live) == 1, "Same conId should share one subscription"
+    market_data._unsubscribe(ib, smart)
+    assert len(ib.live) == 1, "Subscription still in use"
+    market_data._unsubscribe(ib, cboe)
+    assert not ib.live, "Cancel must be sent for the subscribing contract"
+    assert 424242 not in market_data._subscriptions
+    print("  ✓ _subscribe()/_unsubscribe() refcounting")
+    
+    return True
+
+
 def test_main_script():
     """Test that main script can be imported."""
     print("\nTesting main script...")
@@ -84,7 +184,10 @@ def run_all_tests():
     tests = [
         test_imports,
         test_utils,
+        test_greeks,
+        test_roll_expiry,
         test_module_functions,
+        test_shared_subscriptions,
         test_main_script,
     ]
     
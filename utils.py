@@ -1,28 +1,58 @@
 """
 Shared utilities for options monitoring.
 """
-from datetime import datetime, timezone
+from datetime import date, datetime
+from functools import lru_cache
+from math import isfinite
+import time
 import pytz
 
 FALLBACK_EXCHANGES = ["SMART", "CBOE"]
 
 
+@lru_cache(maxsize=1024)
+def parse_expiry(yyyymmdd: str) -> date:
+    """Parse a YYYYMMDD expiry (memoized: the set of expiries is small and repeats)."""
+    return datetime.strptime(yyyymmdd, "%Y%m%d").date()
+
+
+def is_missing(value) -> bool:
+    """True if value is None, NaN or infinite, i.e. not a usable number."""
+    return value is None or not isfinite(value)
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# DTE per expiry for the current UTC day; cleared when the day changes
+_dte_cache = {}
+_dte_day = None
+
+
 def dte(yyyymmdd: str) -> int:
     """Calculate days to expiration from YYYYMMDD format."""
-    dt = datetime.strptime(yyyymmdd, "%Y%m%d").date()
-    return (dt - datetime.now(timezone.utc).date()).days
+    global _dte_day
+    # UTC day number straight from the epoch clock (cheaper than building a
+    # datetime); a new day invalidates every memoized DTE
+    day = int(time.time() // 86400)
+    if day != _dte_day:
+        _dte_cache.clear()
+        _dte_day = day
+    days = _dte_cache.get(yyyymmdd)
+    if days is None:
+        days = parse_expiry(yyyymmdd).toordinal() - _EPOCH_ORDINAL - day
+        _dte_cache[yyyymmdd] = days
+    return days
 
 
-def is_market_open():
-    """
-    Check if US stock market is currently open.
-    
-    Returns:
-        bool: True if market is open, False otherwise
-    """
-    eastern = pytz.timezone('US/Eastern')
-    now = datetime.now(eastern)
-    
+# Market hours are US/Eastern
+_EASTERN = pytz.timezone('US/Eastern')
+
+# get_market_status() is computed at most once per window of this many seconds
+_STATUS_WINDOW = 30
+
+
+def _is_open_at(now):
+    """True if the market is open at now (a US/Eastern datetime)."""
     # Check if weekend
     if now.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
         return False
@@ -40,17 +70,35 @@ def is_market_open():
     return True
 
 
+def is_market_open():
+    """
+    Check if US stock market is currently open.
+    
+    Returns:
+        bool: True if market is open, False otherwise
+    """
+    return _is_open_at(datetime.now(_EASTERN))
+
+
 def get_market_status():
     """
     Get detailed market status information.
     
+    The status is computed once per 30-second window (current_time is
+    when it was computed); later calls in the window get a copy.
+    
     Returns:
         dict: Market status with details
     """
-    eastern = pytz.timezone('US/Eastern')
-    now = datetime.now(eastern)
+    return dict(_market_status(int(time.time() // _STATUS_WINDOW)))
+
+
+@lru_cache(maxsize=4)
+def _market_status(window):
+    """get_market_status() for one time window (the argument is the cache key)."""
+    now = datetime.now(_EASTERN)
     
-    is_open = is_market_open()
+    is_open = _is_open_at(now)
     
     if now.weekday() >= 5:
         reason = "Weekend"